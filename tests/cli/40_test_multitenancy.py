@@ -141,7 +141,8 @@ class MultitenancyTests(unittest.TestCase):
             stack.enter_context(mock.patch.object(mt.MTDatabase, 'get_baseline_version', return_value=7))
             stack.enter_context(mock.patch.object(mt.os.path, 'exists', return_value=True))
             stack.enter_context(mock.patch('builtins.open', mock.mock_open(read_data='{}')))
-            stack.enter_context(mock.patch.object(mt.json, 'load', return_value=baseline))
+            stack.enter_context(mock.patch.object(
+                mt.MTFunctions, 'load_baseline_cached', return_value=baseline))
             apply_baseline = stack.enter_context(mock.patch.object(
                 mt.BaselineApplicator,
                 'apply_baseline_to_site',
@@ -156,7 +157,7 @@ class MultitenancyTests(unittest.TestCase):
                 manager.attach_mock(set_permalink, 'set_permalink_structure')
                 manager.attach_mock(cleanup_mock, 'cleanup_failed_site')
                 manager.attach_mock(log_mocks['error'], 'log_error')
-            stack.enter_context(mock.patch.object(mt, 'setwebrootpermissions'))
+            stack.enter_context(mock.patch.object(mt.MTFunctions, 'apply_tree_permissions'))
             if nginx_validate_results is None:
                 stack.enter_context(mock.patch.object(
                     mt.MTFunctions, 'validate_nginx_config_recoverable',
@@ -165,9 +166,11 @@ class MultitenancyTests(unittest.TestCase):
                 stack.enter_context(mock.patch.object(
                     mt.MTFunctions, 'validate_nginx_config_recoverable',
                     side_effect=nginx_validate_results))
-            os_remove = stack.enter_context(mock.patch.object(mt.os, 'remove'))
+            os_unlink = stack.enter_context(mock.patch.object(mt.os, 'unlink'))
             stack.enter_context(mock.patch.object(mt.os, 'chmod'))
-            stack.enter_context(mock.patch.object(mt.WOFileUtils, 'create_symlink'))
+            stack.enter_context(mock.patch.object(mt.os, 'symlink'))
+            stack.enter_context(mock.patch.object(mt.os, 'replace'))
+            stack.enter_context(mock.patch.object(mt.MTFunctions, '_reload_nginx_service', return_value=True))
             stack.enter_context(mock.patch.object(mt.MTFunctions, 'safe_nginx_reload', return_value=True))
             stack.enter_context(mock.patch.object(mt.MTDatabase, 'get_current_release', return_value='current'))
             stack.enter_context(mock.patch.object(mt, 'addNewSite'))
@@ -185,7 +188,7 @@ class MultitenancyTests(unittest.TestCase):
             'wpredis_during_package_check': spc_seen.get('wpredis'),
             'cleanup_failed_site': cleanup_mock,
             'log_error': log_mocks['error'],
-            'os_remove': os_remove,
+            'os_unlink': os_unlink,
         }
 
     @unittest.skipIf(shutil.which('php') is None, 'php not on PATH')
@@ -363,9 +366,9 @@ class MultitenancyTests(unittest.TestCase):
         manager = mock.Mock()
 
         calls = self._run_create_impl_with_mocks(
-            manager=manager, nginx_validate_results=[True, False])
+            manager=manager, nginx_validate_results=[False, True])
 
-        calls['os_remove'].assert_called_once_with(
+        calls['os_unlink'].assert_called_once_with(
             '/etc/nginx/sites-enabled/example.com')
         names = [call[0] for call in manager.mock_calls]
         self.assertIn('cleanup_failed_site', names)
@@ -759,7 +762,192 @@ url-only = https://example.com/url-only.zip
         self.assertEqual(baseline['plugins'], ['legacy-active', 'legacy-github'])
         self.assertEqual(baseline['theme'], 'legacy-theme')
 
+    def test_admin_password_hint_names_the_domain(self):
+        with mock.patch.object(mtf.os.path, 'exists', return_value=False):
+            self.assertEqual(MTFunctions.get_admin_password(mock.Mock(), 'example.com'),
+                             'Check /var/www/example.com/.admin_pass')
+
+    @unittest.skipIf(shutil.which('git') is None, 'git not on PATH')
+    def test_initialize_git_tracking_commits_baseline_with_local_identity(self):
+        os.makedirs(os.path.join(self.tmp, 'config'))
+        with open(os.path.join(self.tmp, 'config', 'baseline.json'), 'w') as fh:
+            fh.write('{}')
+        infra = SharedInfrastructure(mock.Mock(), self.tmp)
+        env = dict(os.environ, HOME=self.tmp, GIT_CONFIG_NOSYSTEM='1')
+        with mock.patch.dict(os.environ, env, clear=True):
+            self.assertTrue(infra.initialize_git_tracking())
+            log = subprocess.run(['git', 'log', '--format=%an|%s', '--name-only'],
+                                 cwd=self.tmp, capture_output=True, text=True)
+        self.assertIn('WordOps Multi-tenancy|Initial baseline configuration', log.stdout)
+        self.assertIn('config/baseline.json', log.stdout)
+
+    def test_apply_tree_permissions_single_walk_keeps_link_targets(self):
+        import pwd
+        tree = os.path.join(self.tmp, 'htdocs')
+        outside = os.path.join(self.tmp, 'shared')
+        os.makedirs(os.path.join(tree, 'wp-content', 'uploads'))
+        os.makedirs(outside)
+        os.chmod(outside, 0o700)
+        with open(os.path.join(tree, 'index.php'), 'w') as fh:
+            fh.write('<?php\n')
+        os.symlink(outside, os.path.join(tree, 'wp'))
+        os.symlink(os.path.join(self.tmp, 'gone'), os.path.join(tree, 'stale.php'))
+        user = pwd.getpwuid(os.getuid()).pw_name
+        with mock.patch.object(mtf.Log, 'debug'), \
+                mock.patch.object(mtf.os, 'lchown', wraps=os.lchown) as lchown:
+            MTFunctions.apply_tree_permissions(
+                mock.Mock(), tree, user, drop_broken_links=True)
+        self.assertFalse(os.path.lexists(os.path.join(tree, 'stale.php')))
+        self.assertIn(mock.call(os.path.join(tree, 'wp'), os.getuid(), os.getgid()),
+                      lchown.call_args_list)
+        self.assertEqual(os.stat(outside).st_mode & 0o777, 0o700)
+
+        MTFunctions.apply_tree_permissions(mock.Mock(), tree, user, modes=(0o755, 0o644))
+        self.assertEqual(os.stat(os.path.join(tree, 'index.php')).st_mode & 0o777, 0o644)
+        self.assertEqual(os.stat(os.path.join(tree, 'wp-content')).st_mode & 0o777, 0o755)
+
+    def test_apply_tree_permissions_keeps_chowning_after_one_failure(self):
+        import pwd
+        tree = os.path.join(self.tmp, 'htdocs')
+        os.makedirs(os.path.join(tree, 'a'))
+        os.makedirs(os.path.join(tree, 'b'))
+        user = pwd.getpwuid(os.getuid()).pw_name
+        failing = tree
+
+        def _lchown(path, uid, gid):
+            if path == failing:
+                raise PermissionError(1, 'Operation not permitted', path)
+
+        with mock.patch.object(mtf.Log, 'debug'), \
+                mock.patch.object(mtf.os, 'lchown', side_effect=_lchown) as lchown:
+            MTFunctions.apply_tree_permissions(mock.Mock(), tree, user)
+        self.assertEqual(
+            sorted(call.args[0] for call in lchown.call_args_list),
+            [tree, os.path.join(tree, 'a'), os.path.join(tree, 'b')])
+
+    def test_list_subdirs_reads_directory_once(self):
+        plugins = os.path.join(self.tmp, 'plugins')
+        os.makedirs(os.path.join(plugins, 'alpha'))
+        os.makedirs(os.path.join(self.tmp, 'elsewhere'))
+        os.symlink(os.path.join(self.tmp, 'elsewhere'), os.path.join(plugins, 'linked'))
+        os.symlink(os.path.join(self.tmp, 'gone'), os.path.join(plugins, 'broken'))
+        open(os.path.join(plugins, 'hello.php'), 'w').close()
+        self.assertEqual(MTFunctions.list_subdirs(plugins), {'alpha', 'linked'})
+        self.assertEqual(MTFunctions.list_subdirs(os.path.join(self.tmp, 'none')), set())
+
+    def test_create_site_directories_is_idempotent(self):
+        site_root = os.path.join(self.tmp, 'www', 'example.com')
+        site_htdocs = os.path.join(site_root, 'htdocs')
+        with mock.patch.object(mtf.Log, 'debug'):
+            MTFunctions.create_site_directories(
+                mock.Mock(), 'example.com', site_root, site_htdocs)
+            MTFunctions.create_site_directories(
+                mock.Mock(), 'example.com', site_root, site_htdocs)
+        for sub in ('htdocs/wp-content/uploads', 'htdocs/wp-content/cache',
+                    'htdocs/wp-content/upgrade', 'logs', 'conf/nginx'):
+            self.assertTrue(os.path.isdir(os.path.join(site_root, sub)))
+
+        os.rmdir(os.path.join(site_root, 'logs'))
+        open(os.path.join(site_root, 'logs'), 'w').close()
+        with mock.patch.object(mtf.Log, 'debug'):
+            with self.assertRaises(FileExistsError):
+                MTFunctions.create_site_directories(
+                    mock.Mock(), 'example.com', site_root, site_htdocs)
+
+    def test_modular_nginx_config_picks_cache_include(self):
+        expected = {
+            'wpfc': 'common/wpfc-php84.conf', 'wpredis': 'common/redis-php84.conf',
+            'wpsc': 'common/wpsc-php84.conf', 'wprocket': 'common/wprocket-php84.conf',
+            'wpce': 'common/wpce-php84.conf', 'basic': 'common/php84.conf',
+        }
+        for cache_type, include in expected.items():
+            with self.subTest(cache_type=cache_type):
+                conf = MTFunctions.generate_modular_nginx_config(
+                    'example.com', '/var/www/example.com', '8.4', cache_type)
+                self.assertIn(f"    include {include};\n", conf)
+                self.assertIn('include common/wpcommon-php84.conf;', conf)
+
+    def test_load_baseline_cached_reparses_only_after_a_rewrite(self):
+        os.makedirs(os.path.join(self.tmp, 'config'))
+        path = os.path.join(self.tmp, 'config', 'baseline.json')
+        with open(path, 'w') as fh:
+            json.dump({'version': 1, 'plugins': ['a']}, fh)
+        with mock.patch.object(mtf, 'orjson', None), \
+                mock.patch.object(mtf.json, 'loads', wraps=json.loads) as load:
+            first = MTFunctions.load_baseline_cached(self.tmp)
+            first['plugins'].append('mutated')
+            self.assertEqual(MTFunctions.load_baseline_cached(self.tmp)['plugins'], ['a'])
+            self.assertEqual(load.call_count, 1)
+            with open(path, 'w') as fh:
+                json.dump({'version': 22, 'plugins': []}, fh)
+            self.assertEqual(MTFunctions.load_baseline_cached(self.tmp)['version'], 22)
+            self.assertEqual(load.call_count, 2)
+
+    def test_write_baseline_replaces_atomically_and_keeps_mode(self):
+        config_dir = os.path.join(self.tmp, 'config')
+        os.makedirs(config_dir)
+        path = os.path.join(config_dir, 'baseline.json')
+        with open(path, 'w') as fh:
+            json.dump({'version': 1}, fh)
+        os.chmod(path, 0o640)
+        self.assertEqual(MTFunctions.load_baseline_cached(self.tmp)['version'], 1)
+        with mock.patch.object(mtf.os, 'fsync', wraps=os.fsync) as fsync:
+            MTFunctions.write_baseline(path, {'version': 2})
+        fsync.assert_called_once()
+        self.assertEqual(os.listdir(config_dir), ['baseline.json'])
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+        with mock.patch('builtins.open', side_effect=AssertionError('re-read')):
+            self.assertEqual(MTFunctions.load_baseline_cached(self.tmp)['version'], 2)
+
+        with mock.patch.object(mtf.json, 'dumps', side_effect=TypeError('bad')):
+            with self.assertRaises(TypeError):
+                MTFunctions.write_baseline(path, {'version': 3})
+        self.assertEqual(os.listdir(config_dir), ['baseline.json'])
+        with open(path) as fh:
+            self.assertEqual(json.load(fh), {'version': 2})
+
+    def test_load_baseline_cached_invalid_json_raises_decode_error(self):
+        os.makedirs(os.path.join(self.tmp, 'config'))
+        with open(os.path.join(self.tmp, 'config', 'baseline.json'), 'w') as fh:
+            fh.write('{"version": 1, "plugins": ["caf\u00e9"]}')
+        self.assertEqual(MTFunctions.load_baseline_cached(self.tmp)['plugins'],
+                         ['caf\u00e9'])
+        with open(os.path.join(self.tmp, 'config', 'baseline.json'), 'w') as fh:
+            fh.write('{"version": ')
+        for parser in (mtf.orjson, None):
+            with self.subTest(orjson=parser is not None), \
+                    mock.patch.object(mtf, 'orjson', parser):
+                mtf._BASELINE_CACHE.clear()
+                with self.assertRaises(json.JSONDecodeError):
+                    MTFunctions.load_baseline_cached(self.tmp)
+
+    def test_clear_all_caches_runs_clean_steps_in_process(self):
+        from wo.cli.plugins.clean import WOCleanController
+        app = mock.Mock()
+        with mock.patch.object(WOCleanController, 'clean_redis') as redis, \
+                mock.patch.object(WOCleanController, 'clean_fastcgi') as fastcgi, \
+                mock.patch.object(WOCleanController, 'clean_opcache') as opcache, \
+                mock.patch.object(mtf.WOShellExec, 'cmd_exec') as cmd_exec, \
+                mock.patch.object(mtf.Log, 'info'), mock.patch.object(mtf.Log, 'debug'):
+            self.assertTrue(MTFunctions.clear_all_caches(app))
+            fastcgi.side_effect = OSError('restart failed')
+            self.assertFalse(MTFunctions.clear_all_caches(app))
+        redis.assert_called_with(app)
+        self.assertEqual(opcache.call_count, 1)
+        cmd_exec.assert_not_called()
 
+    def test_worker_count_clamps_and_parallel_map_keeps_order(self):
+        self.assertEqual(MTFunctions.worker_count({}, 'update_workers'), 4)
+        self.assertEqual(MTFunctions.worker_count({'update_workers': '64'}, 'update_workers'), 16)
+        self.assertEqual(MTFunctions.worker_count({'update_workers': '0'}, 'update_workers'), 1)
+        self.assertEqual(MTFunctions.worker_count({'update_workers': 'x'}, 'update_workers'), 4)
+        with mock.patch.object(mtf.Log, 'debug'):
+            for workers in (1, 4):
+                with self.subTest(workers=workers):
+                    self.assertEqual(
+                        MTFunctions.parallel_map(mock.Mock(), range(10), lambda n: n * n, workers),
+                        [n * n for n in range(10)],
+                    )
 
 
 class InstallWordpressPermalinkTests(unittest.TestCase):
@@ -977,6 +1165,141 @@ class SetWpConfigRedisDbTests(unittest.TestCase):
             self.assertFalse(MTFunctions.set_wp_config_redis_db(mock.Mock(), tmp, 7))
 
 
+class MultitenancyConfirmTests(unittest.TestCase):
+    """Confirmation prompts never block on a non-interactive stdin."""
+
+    def setUp(self):
+        if mt is None:
+            self.skipTest(f"multitenancy controller import unavailable: {_mt_import_error}")
+        self.ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        self.ctrl.app = mock.Mock()
+
+    def test_confirm_skips_prompt_when_forced(self):
+        with mock.patch('builtins.input') as prompt:
+            self.assertTrue(self.ctrl._confirm('Continue? ', True))
+        prompt.assert_not_called()
+
+    def test_confirm_refuses_on_non_tty_stdin(self):
+        with mock.patch.object(mt.sys, 'stdin') as stdin, \
+                mock.patch('builtins.input') as prompt, \
+                mock.patch('wo.core.logging.Log.error') as log_error:
+            stdin.isatty.return_value = False
+            self.assertFalse(self.ctrl._confirm('Continue? ', False))
+        prompt.assert_not_called()
+        self.assertIn('--yes', log_error.call_args[0][1])
+        self.assertFalse(log_error.call_args.kwargs['exit'])
+
+    def test_confirm_prompts_on_tty(self):
+        with mock.patch.object(mt.sys, 'stdin') as stdin, \
+                mock.patch('builtins.input', return_value=' Y ') as prompt:
+            stdin.isatty.return_value = True
+            self.assertTrue(self.ctrl._confirm('Continue? ', False))
+        prompt.assert_called_once_with('Continue? ')
+
+    def test_confirm_token_must_match_exactly(self):
+        with mock.patch.object(mt.sys, 'stdin') as stdin, \
+                mock.patch('builtins.input', side_effect=['remove', ' REMOVE\n']):
+            stdin.isatty.return_value = True
+            self.assertFalse(self.ctrl._confirm('Type: ', False, token='REMOVE'))
+            self.assertTrue(self.ctrl._confirm('Type: ', False, token='REMOVE'))
+
+    def test_delete_many_aborts_on_non_tty_without_force_or_yes(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        domains_file = os.path.join(tmp, 'domains.txt')
+        with open(domains_file, 'w') as fh:
+            fh.write('a.example.com\n')
+        pargs = mock.Mock()
+        pargs.domains_file = domains_file
+        pargs.parallel = 1
+        pargs.force = pargs.yes = False
+        self.ctrl.app.pargs = pargs
+        session = _memory_db_session()
+        self.addCleanup(session.remove)
+        from wo.cli.plugins.multitenancy_db import MultitenancySite
+        session.add(MultitenancySite(domain='a.example.com'))
+        session.commit()
+
+        with contextlib.ExitStack() as stack:
+            for method in ('info', 'warn', 'error', 'debug'):
+                stack.enter_context(mock.patch(f'wo.core.logging.Log.{method}'))
+            stack.enter_context(mock.patch.object(mt.MTDatabase, 'is_initialized', return_value=True))
+            stack.enter_context(mock.patch('wo.core.database.db_session', session))
+            stdin = stack.enter_context(mock.patch.object(mt.sys, 'stdin'))
+            stdin.isatty.return_value = False
+            prompt = stack.enter_context(mock.patch('builtins.input'))
+            run = stack.enter_context(mock.patch.object(mt.subprocess, 'run'))
+            delete_one = stack.enter_context(mock.patch.object(
+                mt.WOMultitenancyController, '_delete_one_site'))
+            self.assertTrue(self.ctrl._delete_many_impl())
+
+        prompt.assert_not_called()
+        run.assert_not_called()
+        delete_one.assert_not_called()
+
+    def test_create_without_site_name_fails_fast_on_non_tty(self):
+        pargs = mock.Mock()
+        pargs.site_name = None
+        self.ctrl.app.pargs = pargs
+
+        class _Stop(Exception):
+            pass
+
+        with mock.patch.object(mt, '_reject_extra_positionals'), \
+                mock.patch.object(mt.sys, 'stdin') as stdin, \
+                mock.patch('builtins.input') as prompt, \
+                mock.patch('wo.core.logging.Log.error', side_effect=_Stop) as log_error:
+            stdin.isatty.return_value = False
+            with self.assertRaises(_Stop):
+                self.ctrl._create_impl()
+        prompt.assert_not_called()
+        self.assertIn('stdin', log_error.call_args[0][1])
+
+
+class MultitenancyRemoveTests(unittest.TestCase):
+    """`wo multitenancy remove` frees the shared root without blocking on it."""
+
+    def _run_remove(self, rename_error=None):
+        if mt is None:
+            self.skipTest(f"multitenancy controller import unavailable: {_mt_import_error}")
+        parent = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, parent, ignore_errors=True)
+        shared_root = os.path.join(parent, 'shared')
+        os.makedirs(os.path.join(shared_root, 'wp-content', 'plugins'))
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        ctrl.app = mock.Mock()
+        ctrl.app.pargs.force = True
+        with contextlib.ExitStack() as stack:
+            for method in ('info', 'warn', 'error', 'debug'):
+                stack.enter_context(mock.patch(f'wo.core.logging.Log.{method}'))
+            stack.enter_context(mock.patch.object(mt.MTDatabase, 'is_initialized', return_value=True))
+            stack.enter_context(mock.patch.object(mt.MTDatabase, 'get_shared_sites', return_value=[]))
+            stack.enter_context(mock.patch.object(
+                mt.MTFunctions, 'load_config', return_value={'shared_root': shared_root}))
+            cleanup = stack.enter_context(mock.patch.object(mt.MTDatabase, 'cleanup'))
+            popen = stack.enter_context(mock.patch.object(mt.subprocess, 'Popen'))
+            if rename_error is not None:
+                stack.enter_context(mock.patch.object(
+                    mt.os, 'rename', side_effect=rename_error))
+            ctrl.remove()
+        cleanup.assert_called_once()
+        return parent, shared_root, popen
+
+    def test_remove_renames_aside_and_deletes_detached(self):
+        parent, shared_root, popen = self._run_remove()
+        self.assertFalse(os.path.exists(shared_root))
+        trash = f"{shared_root}.removing-{os.getpid()}"
+        self.assertEqual(os.listdir(parent), [os.path.basename(trash)])
+        popen.assert_called_once()
+        self.assertEqual(popen.call_args.args[0], ['rm', '-rf', '--', trash])
+        self.assertTrue(popen.call_args.kwargs['start_new_session'])
+
+    def test_remove_falls_back_to_rmtree_when_rename_fails(self):
+        parent, shared_root, popen = self._run_remove(rename_error=OSError(16, 'busy'))
+        self.assertEqual(os.listdir(parent), [])
+        popen.assert_not_called()
+
+
 class MultitenancyDeleteCacheTests(unittest.TestCase):
     """`wo multitenancy delete` purges the domain's caches only on success."""
 
@@ -994,7 +1317,7 @@ class MultitenancyDeleteCacheTests(unittest.TestCase):
         site.redis_db = 3
         site.php_version = '8.4'
         session = mock.Mock()
-        session.query.return_value.filter_by.return_value.first.return_value = site
+        session.execute.return_value.first.return_value = site
         with contextlib.ExitStack() as stack:
             for method in ('info', 'warn', 'error', 'debug'):
                 stack.enter_context(mock.patch(f'wo.core.logging.Log.{method}'))
@@ -1002,12 +1325,16 @@ class MultitenancyDeleteCacheTests(unittest.TestCase):
             stack.enter_context(mock.patch('wo.core.database.db_session', session))
             stack.enter_context(mock.patch.object(mt.os.path, 'isdir', return_value=False))
             stack.enter_context(mock.patch.object(
-                mt.subprocess, 'run',
-                return_value=mock.Mock(returncode=returncode, stdout='', stderr='err'),
+                mt.WOMultitenancyController, '_delete_one_site',
+                return_value=None if returncode == 0 else 'Failed to delete site: err',
             ))
             purge = stack.enter_context(mock.patch.object(mt.MTFunctions, 'purge_site_cache'))
             reset = stack.enter_context(mock.patch.object(
                 mt.MTFunctions, 'reset_opcache', return_value=True))
+            self.untrack = stack.enter_context(mock.patch.object(
+                mt.MTDatabase, 'delete_sites', return_value=1))
+            stack.enter_context(mock.patch.object(mt, 'write_tombstone', return_value=True))
+            stack.enter_context(mock.patch.object(ctrl, '_sync_wp_cron_or_fail'))
             ctrl._delete_impl()
         return purge, reset, ctrl
 
@@ -1015,11 +1342,369 @@ class MultitenancyDeleteCacheTests(unittest.TestCase):
         purge, reset, ctrl = self._run_delete(returncode=0)
         purge.assert_called_once_with(ctrl, 'example.com', 'example_com_', 3)
         reset.assert_called_once_with(ctrl, php_key='php84')
+        self.untrack.assert_called_once_with(ctrl, ['example.com'])
 
     def test_delete_skips_purge_when_site_delete_fails(self):
         purge, reset, ctrl = self._run_delete(returncode=1)
         purge.assert_not_called()
         reset.assert_not_called()
+        self.untrack.assert_not_called()
+
+    def test_delete_one_site_runs_site_delete_steps_in_process(self):
+        if mt is None:
+            self.skipTest(f"multitenancy controller import unavailable: {_mt_import_error}")
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        ctrl.app = mock.Mock()
+        ctrl.app.config.has_section.return_value = False
+        site = mock.Mock(site_type='wp', db_name='db1', db_user='u1',
+                         site_path='/var/www/example.com')
+        manager = mock.Mock()
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(mock.patch.object(mt.os.path, 'isdir', return_value=False))
+            stack.enter_context(mock.patch.object(mt, 'getSiteInfo', return_value=site))
+            run = stack.enter_context(mock.patch.object(mt.subprocess, 'run'))
+            for name in ('deleteDB', 'updateSiteInfo', 'deleteWebRoot',
+                         'removeNginxConf', 'deleteSiteInfo'):
+                manager.attach_mock(
+                    stack.enter_context(mock.patch.object(mt, name)), name)
+            manager.attach_mock(
+                stack.enter_context(mock.patch.object(mt.WOAcme, 'removeconf')),
+                'removeconf')
+            stack.enter_context(mock.patch('wo.core.logging.Log.debug'))
+            self.assertIsNone(ctrl._delete_one_site('example.com'))
+        run.assert_not_called()
+        self.assertEqual(manager.mock_calls, [
+            mock.call.deleteDB(ctrl, 'db1', 'u1', 'localhost', False),
+            mock.call.updateSiteInfo(ctrl, 'example.com', db_name='deleted',
+                                     db_user='deleted', db_password='deleted'),
+            mock.call.deleteWebRoot(ctrl, '/var/www/example.com'),
+            mock.call.updateSiteInfo(ctrl, 'example.com', webroot='deleted'),
+            mock.call.removeNginxConf(ctrl, 'example.com'),
+            mock.call.deleteSiteInfo(ctrl, 'example.com'),
+            mock.call.removeconf(ctrl, 'example.com'),
+        ])
+
+    def test_delete_uses_subprocess_when_requested_by_env(self):
+        if mt is None:
+            self.skipTest(f"multitenancy controller import unavailable: {_mt_import_error}")
+        with mock.patch.dict(os.environ, {'WO_MT_SUBPROC_DELETE': '1'}), \
+                mock.patch.object(mt.WOMultitenancyController, '_delete_one_subprocess',
+                                  return_value=None) as subproc:
+            purge, _, ctrl = self._run_delete(returncode=1)
+        subproc.assert_called_once_with('example.com')
+        purge.assert_called_once()
+
+    def test_site_delete_subprocess_reports_merged_output(self):
+        if mt is None:
+            self.skipTest(f"multitenancy controller import unavailable: {_mt_import_error}")
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        ctrl.app = mock.Mock()
+        with mock.patch.object(mt.os.path, 'isdir', return_value=False), \
+                mock.patch.object(mt, '_WO_BIN', '/usr/local/bin/wo'), \
+                mock.patch.object(mt.subprocess, 'run', return_value=mock.Mock(
+                    returncode=1, stdout='Unable to drop database')) as run:
+            error = ctrl._delete_one_subprocess('example.com')
+        self.assertEqual(error, 'Failed to delete site: Unable to drop database')
+        run.assert_called_once_with(
+            ['/usr/local/bin/wo', 'site', 'delete', 'example.com', '--no-prompt'],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+            timeout=300)
+
+    def test_untracked_domain_hint_names_the_domain(self):
+        if mt is None:
+            self.skipTest(f"multitenancy controller import unavailable: {_mt_import_error}")
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        ctrl.app = mock.Mock()
+        ctrl.app.pargs.site_name = 'example.com'
+        ctrl.app.pargs.newsite_name = ctrl.app.pargs.plugin_slug = None
+        ctrl.app.pargs.theme_slug = None
+        session = mock.Mock()
+        session.execute.return_value.first.return_value = None
+        with contextlib.ExitStack() as stack:
+            info = stack.enter_context(mock.patch('wo.core.logging.Log.info'))
+            stack.enter_context(mock.patch('wo.core.logging.Log.error'))
+            stack.enter_context(mock.patch.object(mt.WODomain, 'validate', return_value='example.com'))
+            stack.enter_context(mock.patch.object(mt.MTDatabase, 'is_initialized', return_value=True))
+            stack.enter_context(mock.patch('wo.core.database.db_session', session))
+            run = stack.enter_context(mock.patch.object(mt.subprocess, 'run'))
+            ctrl._delete_impl()
+        run.assert_not_called()
+        info.assert_called_with(ctrl, 'Use: wo site delete example.com for regular sites')
+
+
+class MultitenancyDeleteManyTests(unittest.TestCase):
+    """`wo multitenancy delete-many` overlaps site deletes and bulk-untracks."""
+
+    def _run_delete_many(self, domains, failing=(), parallel=2):
+        if mt is None:
+            self.skipTest(f"multitenancy controller import unavailable: {_mt_import_error}")
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        domains_file = os.path.join(tmp, 'domains.txt')
+        with open(domains_file, 'w') as fh:
+            fh.write('# teardown\n' + '\n'.join(domains) + '\n\n')
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        pargs = mock.Mock()
+        pargs.domains_file = domains_file
+        pargs.parallel = parallel
+        pargs.force = True
+        pargs.site_name = pargs.newsite_name = None
+        pargs.plugin_slug = pargs.theme_slug = None
+        ctrl.app = mock.Mock()
+        ctrl.app.pargs = pargs
+        ctrl.app.config.has_section.return_value = False
+        session = _memory_db_session()
+        self.addCleanup(session.remove)
+        from wo.cli.plugins.multitenancy_db import MultitenancySite
+        for index, domain in enumerate(domains):
+            session.add(MultitenancySite(domain=domain, redis_prefix=f'p{index}_',
+                                         redis_db=index + 1, php_version='8.4'))
+        session.add(MultitenancySite(domain='keep.example.com'))
+        session.commit()
+
+        def _site_info(_ctrl, domain):
+            return mock.Mock(site_type='wp', db_name=f'db_{domain}',
+                             db_user=f'u_{domain}', site_path=f'/var/www/{domain}')
+
+        def _rmtree(path):
+            if path.rsplit('/', 1)[1] in failing:
+                raise PermissionError(13, 'Permission denied', path)
+
+        mocks = mock.Mock()
+        mocks.tracked_at_commit = None
+
+        def _git_add(*_args, **_kwargs):
+            mocks.tracked_at_commit = self._tracked(session)
+        with contextlib.ExitStack() as stack:
+            for method in ('info', 'warn', 'error', 'debug'):
+                stack.enter_context(mock.patch(f'wo.core.logging.Log.{method}'))
+            stack.enter_context(mock.patch.object(mt.MTDatabase, 'is_initialized', return_value=True))
+            stack.enter_context(mock.patch('wo.core.database.db_session', session))
+            stack.enter_context(mock.patch('wo.cli.plugins.multitenancy_db.db_session', session))
+            # Webroots exist; the cert store backup/restore is skipped.
+            stack.enter_context(mock.patch.object(
+                mt.os.path, 'isdir', side_effect=lambda path: path.startswith('/var/www/')))
+            stack.enter_context(mock.patch.object(mt, 'getSiteInfo', side_effect=_site_info))
+            mocks.deleteDB = stack.enter_context(mock.patch.object(mt, 'deleteDB'))
+            mocks.rmtree = stack.enter_context(mock.patch.object(
+                mt.shutil, 'rmtree', side_effect=_rmtree))
+            mocks.deleteSiteInfo = stack.enter_context(mock.patch.object(mt, 'deleteSiteInfo'))
+            mocks.removeconf = stack.enter_context(mock.patch.object(mt.WOAcme, 'removeconf'))
+            mocks.reload = stack.enter_context(mock.patch.object(
+                mt.MTFunctions, 'safe_nginx_reload', return_value=True))
+            mocks.git = stack.enter_context(mock.patch.object(
+                mt.WOGit, 'add', side_effect=_git_add))
+            mocks.run = stack.enter_context(mock.patch.object(mt.subprocess, 'run'))
+            purge = stack.enter_context(mock.patch.object(mt.MTFunctions, 'purge_site_cache'))
+            stack.enter_context(mock.patch.object(mt.MTFunctions, 'reset_opcache', return_value=True))
+            stack.enter_context(mock.patch.object(mt, 'write_tombstone', return_value=True))
+            stack.enter_context(mock.patch.object(mt.MTFunctions, 'sync_wp_cron_entries', return_value=True))
+            result = ctrl._delete_many_impl()
+        return result, mocks, purge, session
+
+    @staticmethod
+    def _tracked(session):
+        from wo.cli.plugins.multitenancy_db import MultitenancySite
+        return sorted(row.domain for row in session.query(MultitenancySite.domain))
+
+    def test_deletes_every_listed_domain_and_untracks_them(self):
+        domains = ['a.example.com', 'b.example.com', 'c.example.com']
+        result, mocks, purge, session = self._run_delete_many(domains)
+        self.assertTrue(result)
+        self.assertEqual(
+            sorted(call.args[1] for call in mocks.deleteDB.call_args_list),
+            [f'db_{d}' for d in domains])
+        self.assertEqual(
+            [call.args[1] for call in mocks.deleteSiteInfo.call_args_list], domains)
+        self.assertEqual(
+            sorted((call.args[1], call.args[2], call.args[3]) for call in purge.call_args_list),
+            [('a.example.com', 'p0_', 1), ('b.example.com', 'p1_', 2), ('c.example.com', 'p2_', 3)])
+        self.assertEqual(self._tracked(session), ['keep.example.com'])
+        mocks.run.assert_not_called()
+
+    def test_nginx_reload_and_commit_run_once_for_the_batch(self):
+        domains = ['a.example.com', 'b.example.com', 'c.example.com']
+        result, mocks, _, _ = self._run_delete_many(domains, parallel=3)
+        self.assertTrue(result)
+        mocks.reload.assert_called_once()
+        mocks.git.assert_called_once()
+        self.assertEqual(mocks.git.call_args.args[1], ['/etc/nginx'])
+
+    def test_nginx_commit_runs_after_every_tenant_is_untracked(self):
+        domains = ['a.example.com', 'b.example.com']
+        result, mocks, purge, _ = self._run_delete_many(domains)
+        self.assertTrue(result)
+        self.assertEqual(mocks.removeconf.call_count, 2)
+        self.assertEqual(purge.call_count, 2)
+        self.assertEqual(mocks.tracked_at_commit, ['keep.example.com'])
+
+    def test_failed_site_delete_keeps_tracking_and_reports_failure(self):
+        result, mocks, purge, session = self._run_delete_many(
+            ['a.example.com', 'b.example.com'], failing=('b.example.com',))
+        self.assertFalse(result)
+        self.assertEqual(
+            sorted(call.args[0] for call in mocks.rmtree.call_args_list),
+            ['/var/www/a.example.com', '/var/www/b.example.com'])
+        mocks.deleteSiteInfo.assert_called_once()
+        self.assertEqual(mocks.deleteSiteInfo.call_args.args[1], 'a.example.com')
+        purge.assert_called_once()
+        self.assertEqual(purge.call_args.args[1], 'a.example.com')
+        self.assertEqual(self._tracked(session), ['b.example.com', 'keep.example.com'])
+
+    def test_lookups_and_deletes_are_chunked(self):
+        domains = [f'site{i}.example.com' for i in range(5)]
+        with mock.patch.object(mt, 'SQL_IN_CHUNK', 2), \
+                mock.patch('wo.cli.plugins.multitenancy_db.SQL_IN_CHUNK', 2):
+            result, mocks, purge, session = self._run_delete_many(domains, parallel=3)
+        self.assertTrue(result)
+        self.assertEqual(purge.call_count, 5)
+        self.assertEqual(self._tracked(session), ['keep.example.com'])
+
+    def test_rejects_non_positive_parallelism(self):
+        result, mocks, _, _ = self._run_delete_many(['a.example.com'], parallel=0)
+        self.assertFalse(result)
+        mocks.deleteDB.assert_not_called()
+        mocks.rmtree.assert_not_called()
+
+
+class MultitenancyBulkCreateTests(unittest.TestCase):
+    """`wo multitenancy bulk-create` provisions a batch behind one reload."""
+
+    def _run_bulk_create(self, domains, failing=(), reload_ok=True, validate=None,
+                         provision=None):
+        if mt is None:
+            self.skipTest(f"multitenancy controller import unavailable: {_mt_import_error}")
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        domains_file = os.path.join(tmp, 'domains.txt')
+        with open(domains_file, 'w') as fh:
+            fh.write('\n'.join(domains) + '\n')
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        pargs = mock.Mock()
+        pargs.domains_file = domains_file
+        pargs.site_name = pargs.newsite_name = None
+        pargs.plugin_slug = pargs.theme_slug = None
+        ctrl.app = mock.Mock()
+        ctrl.app.pargs = pargs
+
+        with contextlib.ExitStack() as stack:
+            for method in ('info', 'warn', 'error', 'debug'):
+                stack.enter_context(mock.patch(f'wo.core.logging.Log.{method}'))
+            stack.enter_context(mock.patch.object(
+                mt.WODomain, 'validate', side_effect=validate or (lambda app, d: d)))
+            stack.enter_context(mock.patch.object(mt, 'check_domain_exists', return_value=False))
+            stack.enter_context(mock.patch.object(mt.MTDatabase, 'is_initialized', return_value=True))
+            stack.enter_context(mock.patch.object(mt.MTFunctions, 'load_config', return_value={}))
+            stack.enter_context(mock.patch.object(mt.MTFunctions, 'preflight_shared_config', return_value=True))
+            stack.enter_context(mock.patch.object(
+                ctrl, '_prepare_create_stack', return_value=('8.4', 'wpfc')))
+            provision = stack.enter_context(mock.patch.object(
+                ctrl, '_provision_site',
+                side_effect=provision or (
+                    lambda domain, *args, **kwargs: domain not in failing)))
+            reload = self.reload = stack.enter_context(mock.patch.object(
+                mt.MTFunctions, 'safe_nginx_reload', return_value=reload_ok))
+            git_add = self.git_add = stack.enter_context(mock.patch.object(mt.WOGit, 'add'))
+            stack.enter_context(mock.patch.object(mt.MTFunctions, 'sync_wp_cron_entries', return_value=True))
+            result = ctrl._bulk_create_impl()
+        return result, provision, reload, git_add
+
+    def test_provisions_each_domain_then_reloads_and_commits_once(self):
+        domains = ['a.example.com', 'b.example.com', 'c.example.com']
+        result, provision, reload, git_add = self._run_bulk_create(domains)
+        self.assertTrue(result)
+        self.assertEqual([call.args[0] for call in provision.call_args_list], domains)
+        self.assertTrue(all(call.kwargs['batch'] for call in provision.call_args_list))
+        reload.assert_called_once()
+        git_add.assert_called_once()
+
+    def test_domains_are_deduped_after_normalizing(self):
+        result, provision, _, _ = self._run_bulk_create(
+            ['www.example.com', 'Example.com', 'https://example.com/', 'b.example.com'],
+            validate=mt.WODomain.validate)
+        self.assertTrue(result)
+        self.assertEqual([call.args[0] for call in provision.call_args_list],
+                         ['example.com', 'b.example.com'])
+
+    def test_failed_site_is_reported_without_stopping_the_batch(self):
+        result, provision, reload, git_add = self._run_bulk_create(
+            ['a.example.com', 'b.example.com'], failing=('a.example.com',))
+        self.assertFalse(result)
+        self.assertEqual(provision.call_count, 2)
+        reload.assert_called_once_with(mock.ANY, 'b.example.com')
+
+    def test_interrupted_batch_still_finishes_created_sites(self):
+        def _provision(domain, *args, **kwargs):
+            if domain == 'b.example.com':
+                raise KeyboardInterrupt
+            return True
+
+        with self.assertRaises(KeyboardInterrupt):
+            self._run_bulk_create(['a.example.com', 'b.example.com'],
+                                  provision=_provision)
+        self.reload.assert_called_once_with(mock.ANY, 'a.example.com')
+        self.git_add.assert_called_once()
+
+    def test_batch_helpers_report_failures_without_exiting(self):
+        if mt is None:
+            self.skipTest(f"multitenancy controller import unavailable: {_mt_import_error}")
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        ctrl.app = mock.Mock()
+        with contextlib.ExitStack() as stack:
+            for method in ('info', 'warn', 'debug'):
+                stack.enter_context(mock.patch(f'wo.core.logging.Log.{method}'))
+            log_error = stack.enter_context(mock.patch('wo.core.logging.Log.error'))
+            stack.enter_context(mock.patch.object(mt.MTFunctions, 'create_site_directories'))
+            stack.enter_context(mock.patch.object(mt, 'setupdatabase', return_value={
+                'wo_db_name': 'db', 'wo_db_user': 'user',
+                'wo_db_pass': 'pass', 'wo_db_host': 'localhost'}))
+            stack.enter_context(mock.patch.object(mt.MTFunctions, 'create_shared_symlinks'))
+            stack.enter_context(mock.patch.object(
+                mt.MTDatabase, 'generate_redis_prefix', return_value='a_'))
+            allocate = stack.enter_context(mock.patch.object(
+                mt.MTDatabase, 'allocate_redis_db', return_value=None))
+            cleanup = stack.enter_context(mock.patch.object(
+                mt.MTFunctions, 'cleanup_failed_site'))
+            self.assertFalse(ctrl._provision_site(
+                'a.example.com', {}, '/var/www/shared', '8.4', 'wpfc', batch=True))
+        self.assertIs(allocate.call_args.kwargs['exit'], False)
+        cleanup.assert_called_once()
+        self.assertEqual(cleanup.call_args.kwargs['db_name'], 'db')
+        self.assertIs(log_error.call_args.kwargs['exit'], False)
+
+    def test_exit_false_helpers_return_or_raise_instead_of_exiting(self):
+        from wo.cli.plugins import sitedb
+        app = mock.Mock()
+        session = mock.Mock()
+        session.commit.side_effect = RuntimeError('locked')
+        with mock.patch.object(sitedb, 'db_session', session), \
+                mock.patch.object(sitedb, 'SiteDB'), \
+                mock.patch('wo.core.logging.Log.debug'), \
+                mock.patch('wo.core.logging.Log.error') as log_error:
+            self.assertFalse(sitedb.addNewSite(
+                app, 'a.example.com', 'wp', 'wpfc', '/var/www/a', exit=False))
+        log_error.assert_called_once_with(app, mock.ANY, False)
+        session.rollback.assert_called_once_with()
+
+        with mock.patch.object(mtf.subprocess, 'run', return_value=mock.Mock(
+                    stdout='databases\n16\n')), \
+                mock.patch('builtins.open', side_effect=OSError('read-only')), \
+                mock.patch('wo.core.logging.Log.error') as log_error:
+            with self.assertRaises(RuntimeError):
+                MTFunctions.ensure_redis_databases(app, 20, exit=False)
+        log_error.assert_not_called()
+
+        with mock.patch('wo.core.logging.Log.error') as log_error:
+            with self.assertRaises(ValueError):
+                MTFunctions.generate_wp_config(
+                    app, '/var/www/a', 'a.example.com', 'db', 'u', 'p',
+                    'localhost', redis_prefix='a_', shared_root="/srv/it's")
+        log_error.assert_not_called()
+
+    def test_reload_failure_fails_the_batch(self):
+        result, _, reload, _ = self._run_bulk_create(['a.example.com'], reload_ok=False)
+        self.assertFalse(result)
+        reload.assert_called_once()
 
 
 class MultitenancyRenameTests(unittest.TestCase):
@@ -2071,20 +2756,7 @@ class BaselineApplicatorTests(unittest.TestCase):
 
 
     def test_ensure_nginx_helper_caps_grants_required_administrator_caps(self):
-        """Nginx Helper caps are granted through exact WP-CLI cap-add calls."""
-        expected_commands = [
-            [
-                'wp', 'cap', 'add', 'administrator',
-                'Nginx Helper | Purge cache',
-                '--path=' + self.site_path, '--allow-root',
-            ],
-            [
-                'wp', 'cap', 'add', 'administrator',
-                'Nginx Helper | Config',
-                '--path=' + self.site_path, '--allow-root',
-            ],
-        ]
-
+        """Nginx Helper caps are granted through one exact WP-CLI cap-add call."""
         with mock.patch.object(
                 mtf.subprocess,
                 'run',
@@ -2095,58 +2767,35 @@ class BaselineApplicatorTests(unittest.TestCase):
                 self.app, 'example.com', self.site_path
             )
 
-        self.assertEqual(
-            run.call_args_list,
+        run.assert_called_once_with(
             [
-                mock.call(
-                    expected_commands[0],
-                    capture_output=True,
-                    text=True,
-                    timeout=BaselineApplicator.WP_CLI_TIMEOUT,
-                ),
-                mock.call(
-                    expected_commands[1],
-                    capture_output=True,
-                    text=True,
-                    timeout=BaselineApplicator.WP_CLI_TIMEOUT,
-                ),
+                'wp', 'cap', 'add', 'administrator',
+                'Nginx Helper | Purge cache', 'Nginx Helper | Config',
+                '--path=' + self.site_path, '--allow-root',
             ],
+            capture_output=True,
+            text=True,
+            timeout=BaselineApplicator.WP_CLI_TIMEOUT,
         )
 
-    def test_ensure_nginx_helper_caps_warns_and_continues_on_failed_cap_add(self):
-        """Rejected cap grants warn but do not abort remaining Nginx Helper caps."""
+    def test_ensure_nginx_helper_caps_warns_on_failed_cap_add(self):
+        """A rejected cap grant warns instead of raising."""
         with mock.patch.object(
                 mtf.subprocess,
                 'run',
-                side_effect=[
-                    self._wp_result(returncode=1, stderr='denied'),
-                    self._wp_result(),
-                ],
+                return_value=self._wp_result(returncode=1, stderr='denied'),
         ) as run, \
                 mock.patch('wo.core.logging.Log.warn') as log_warn:
             BaselineApplicator.ensure_nginx_helper_caps(
                 self.app, 'example.com', self.site_path
             )
 
-        self.assertEqual(
-            [call.args[0] for call in run.call_args_list],
-            [
-                [
-                    'wp', 'cap', 'add', 'administrator',
-                    'Nginx Helper | Purge cache',
-                    '--path=' + self.site_path, '--allow-root',
-                ],
-                [
-                    'wp', 'cap', 'add', 'administrator',
-                    'Nginx Helper | Config',
-                    '--path=' + self.site_path, '--allow-root',
-                ],
-            ],
-        )
+        run.assert_called_once()
         log_warn.assert_called_once()
+        self.assertIn('denied', log_warn.call_args[0][1])
 
-    def test_ensure_nginx_helper_caps_warns_and_continues_on_timeout(self):
-        """WP-CLI cap-add exceptions are warn-only and the second cap is still tried."""
+    def test_ensure_nginx_helper_caps_warns_on_timeout(self):
+        """WP-CLI cap-add timeouts are warn-only."""
         with mock.patch.object(
                 mtf.subprocess,
                 'run',
@@ -2157,8 +2806,8 @@ class BaselineApplicatorTests(unittest.TestCase):
                 self.app, 'example.com', self.site_path
             )
 
-        self.assertEqual(run.call_count, 2)
-        self.assertEqual(log_warn.call_count, 2)
+        self.assertEqual(run.call_count, 1)
+        self.assertEqual(log_warn.call_count, 1)
 
     def test_ensure_nginx_helper_caps_propagates_unexpected_subprocess_errors(self):
         """Unexpected subprocess errors must not be hidden by cap grant warnings."""
@@ -2299,12 +2948,7 @@ class BaselineApplicatorTests(unittest.TestCase):
         self.assertEqual(self._nginx_helper_cap_commands(run), [
             [
                 'wp', 'cap', 'add', 'administrator',
-                'Nginx Helper | Purge cache',
-                '--path=' + self.site_path, '--allow-root',
-            ],
-            [
-                'wp', 'cap', 'add', 'administrator',
-                'Nginx Helper | Config',
+                'Nginx Helper | Purge cache', 'Nginx Helper | Config',
                 '--path=' + self.site_path, '--allow-root',
             ],
         ])
@@ -2357,12 +3001,7 @@ class BaselineApplicatorTests(unittest.TestCase):
                     self.assertEqual(self._nginx_helper_cap_commands(run), [
                         [
                             'wp', 'cap', 'add', 'administrator',
-                            'Nginx Helper | Purge cache',
-                            '--path=' + self.site_path, '--allow-root',
-                        ],
-                        [
-                            'wp', 'cap', 'add', 'administrator',
-                            'Nginx Helper | Config',
+                            'Nginx Helper | Purge cache', 'Nginx Helper | Config',
                             '--path=' + self.site_path, '--allow-root',
                         ],
                     ])
@@ -2518,14 +3157,13 @@ class BaselineApplicatorTests(unittest.TestCase):
         self.assertIsNone(result['error'])
         self.assertEqual(result['skipped_plugins'], ['missing-plugin'])
         commands = [call.args[0] for call in run.call_args_list]
-        self.assertIn([
+        self.assertEqual([
+            cmd for cmd in commands if cmd[:3] == ['wp', 'plugin', 'activate']
+        ], [[
             'wp', 'plugin', 'activate', 'good-plugin/good-plugin.php',
+            'after-plugin/after-plugin.php',
             '--path=' + self.site_path, '--allow-root',
-        ], commands)
-        self.assertIn([
-            'wp', 'plugin', 'activate', 'after-plugin/after-plugin.php',
-            '--path=' + self.site_path, '--allow-root',
-        ], commands)
+        ]])
         self.assertIn([
             'wp', 'theme', 'activate', 'baseline-theme',
             '--path=' + self.site_path, '--allow-root',
@@ -2564,10 +3202,15 @@ class BaselineApplicatorTests(unittest.TestCase):
         self.assertIsNone(result['error'])
         self.assertEqual(result['skipped_plugins'], ['bad-plugin'])
         commands = [call.args[0] for call in run.call_args_list]
-        self.assertIn([
-            'wp', 'plugin', 'activate', 'after-plugin/after-plugin.php',
-            '--path=' + self.site_path, '--allow-root',
-        ], commands)
+        # The failed batch activation falls back to one call per plugin.
+        self.assertEqual([
+            cmd[3:-2] for cmd in commands
+            if cmd[:3] == ['wp', 'plugin', 'activate']
+        ], [
+            ['bad-plugin/bad-plugin.php', 'after-plugin/after-plugin.php'],
+            ['bad-plugin/bad-plugin.php'],
+            ['after-plugin/after-plugin.php'],
+        ])
         self.assertTrue(log_warn.called)
 
     def test_apply_baseline_to_site_skips_plugin_on_activation_timeout(self):
@@ -3169,10 +3812,7 @@ class BaselineApplicatorSitesTests(unittest.TestCase):
         site.site_path = '/var/www/example.com'
         site.is_enabled = True
         session = mock.Mock()
-        query = session.query.return_value
-        query.filter_by.return_value = query
-        query.all.return_value = [site]
-        query.first.return_value = site
+        session.execute.return_value.all.return_value = [site]
         return session
 
     def _write_baseline(self, baseline):
@@ -3180,7 +3820,7 @@ class BaselineApplicatorSitesTests(unittest.TestCase):
             json.dump(baseline, fh)
 
     def _enabled_site_from_session(self, session):
-        return session.query.return_value.filter_by.return_value.all.return_value[0]
+        return session.execute.return_value.all.return_value[0]
 
     def test_apply_baseline_to_sites_passes_db_cache_type_to_site_apply(self):
         """Each DB row's cache_type is threaded into per-site baseline apply."""
@@ -3380,6 +4020,35 @@ class BaselineApplicatorSitesTests(unittest.TestCase):
             '/var/www/example.com/htdocs',
         )
 
+    def test_apply_baseline_to_sites_advances_version_only_when_complete(self):
+        """Each applied site gets one UPDATE; skipped plugins hold its version."""
+        from wo.cli.plugins.multitenancy_db import MultitenancySite
+        session = _memory_db_session()
+        self.addCleanup(session.remove)
+        for domain in ('full.example.com', 'partial.example.com'):
+            session.add(MultitenancySite(domain=domain, site_path=f'/var/www/{domain}',
+                                         is_enabled=True, baseline_version=1))
+        session.commit()
+
+        def apply_site(app, domain, *args, **kwargs):
+            skipped = ['bad-plugin'] if domain == 'partial.example.com' else []
+            return {'success': True, 'error': None, 'skipped_plugins': skipped}
+
+        with mock.patch('wo.core.database.db_session', session), \
+                mock.patch.object(BaselineApplicator, 'apply_baseline_to_site',
+                                  side_effect=apply_site), \
+                mock.patch('wo.core.shellexec.WOShellExec.cmd_exec'), \
+                mock.patch('wo.core.logging.Log.info'), \
+                mock.patch('wo.core.logging.Log.debug'), \
+                mock.patch('wo.core.logging.Log.warn'):
+            BaselineApplicator.apply_baseline_to_sites(
+                self.app, self.config, baseline_version=7,
+            )
+
+        versions = dict(session.query(MultitenancySite.domain,
+                                      MultitenancySite.baseline_version))
+        self.assertEqual(versions, {'full.example.com': 7, 'partial.example.com': 1})
+
 class ReloadServicesAfterConfigChangeTests(unittest.TestCase):
 
     def setUp(self):
@@ -3503,6 +4172,26 @@ bare-theme = owner/theme
         self.assertEqual(config['github_plugins'], {'bare': 'owner/repo'})
         self.assertEqual(config['github_themes'], {'bare-theme': 'owner/theme'})
 
+    def test_load_config_parses_once_per_command_until_file_changes(self):
+        conf = os.path.join(self.tmp, 'multitenancy.conf')
+        with open(conf, 'w') as fh:
+            fh.write("[multitenancy]\nshared_root = /srv/one\n")
+        app = mock.Mock()
+        with mock.patch.object(mtf, 'MT_CONFIG_FILE', conf), \
+                mock.patch.object(MTFunctions, '_parse_config',
+                                  wraps=MTFunctions._parse_config) as parse:
+            first = MTFunctions.load_config(app)
+            first['shared_root'] = 'mutated'
+            self.assertEqual(MTFunctions.load_config(app)['shared_root'], '/srv/one')
+            self.assertEqual(parse.call_count, 1)
+
+            with open(conf, 'w') as fh:
+                fh.write("[multitenancy]\nshared_root = /srv/second\n")
+            self.assertEqual(MTFunctions.load_config(app)['shared_root'], '/srv/second')
+            self.assertEqual(MTFunctions.load_config(mock.Mock())['shared_root'],
+                             '/srv/second')
+            self.assertEqual(parse.call_count, 3)
+
     def test_create_baseline_config_writes_sources_from_config_sections(self):
         infra = self._infra()
         os.makedirs(infra.config_dir, exist_ok=True)
@@ -4027,6 +4716,53 @@ bare-theme = owner/theme
             'ref': 'main',
         })
 
+    def test_add_plugin_rejects_duplicate_before_downloading(self):
+        if mt is None:
+            self.skipTest(f'multitenancy controller import unavailable: {_mt_import_error}')
+        self._write_baseline({'version': 2, 'plugins': ['custom'], 'theme': 'active'})
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        pargs = mock.Mock()
+        pargs.plugin_slug = 'custom'
+        pargs.site_name = None
+        pargs.github = pargs.branch = pargs.tag = pargs.url = None
+        ctrl.app = mock.Mock()
+        ctrl.app.pargs = pargs
+
+        with contextlib.ExitStack() as stack:
+            self._patch_logs(stack)
+            stack.enter_context(mock.patch(
+                'wo.core.logging.Log.error', side_effect=SystemExit(1)))
+            stack.enter_context(mock.patch.object(mt.MTDatabase, 'is_initialized', return_value=True))
+            stack.enter_context(mock.patch.object(mt.MTFunctions, 'load_config', return_value={'shared_root': self.tmp}))
+            download = stack.enter_context(mock.patch.object(mt.SharedInfrastructure, 'download_plugin'))
+            with self.assertRaises(SystemExit):
+                ctrl.add_plugin()
+
+        download.assert_not_called()
+        self.assertEqual(self._read_baseline()['version'], 2)
+
+    def test_baseline_source_rejects_bad_input_before_download(self):
+        if mt is None:
+            self.skipTest(f'multitenancy controller import unavailable: {_mt_import_error}')
+        for slug, kwargs in (
+                ('../etc', {}), ('my plugin', {}), ('Plugin', {}), ('', {}),
+                ('ok', {'github_repo': 'o/r', 'url': 'https://x'}),
+                ('ok', {'github_repo': 'o/r', 'branch': 'main', 'tag': 'v1'}),
+                ('ok', {'tag': 'v1'})):
+            with self.subTest(slug=slug, **kwargs):
+                with self.assertRaises(ValueError):
+                    mt._baseline_source('plugin', slug, **kwargs)
+
+        info, download, record = mt._baseline_source(
+            'theme', 'my_theme-2', github_repo='o/r', tag='v1')
+        self.assertEqual(info, 'from GitHub: o/r (tag: v1)')
+        self.assertEqual(record, {'type': 'github', 'repo': 'o/r',
+                                  'ref_type': 'tag', 'ref': 'v1'})
+        infra = mock.Mock()
+        download(infra)
+        infra.download_theme_from_github.assert_called_once_with(
+            'o/r', 'my_theme-2', branch=None, tag='v1')
+
     def test_add_theme_url_records_source_in_baseline(self):
         if mt is None:
             self.skipTest(f'multitenancy controller import unavailable: {_mt_import_error}')
@@ -4065,6 +4801,77 @@ bare-theme = owner/theme
             'url': 'https://example.com/custom-theme.zip',
         })
 
+    def test_add_theme_default_skips_download_only_for_the_same_source(self):
+        if mt is None:
+            self.skipTest(f'multitenancy controller import unavailable: {_mt_import_error}')
+        same = {'type': 'github', 'repo': 'o/r', 'ref_type': 'tag', 'ref': 'v1'}
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        pargs = mock.Mock()
+        pargs.theme_slug = 'active'
+        pargs.site_name = None
+        pargs.set_default = True
+        pargs.apply_now = False
+        pargs.github = 'o/r'
+        pargs.branch = None
+        pargs.url = None
+        ctrl.app = mock.Mock()
+        ctrl.app.pargs = pargs
+
+        def download(repo, theme_slug, branch=None, tag=None):
+            os.makedirs(os.path.join(self.tmp, 'wp-content', 'themes', theme_slug),
+                        exist_ok=True)
+            return True
+
+        for tag, expected_version in (('v1', 4), ('v2', 5)):
+            pargs.tag = tag
+            self._write_baseline({'version': 4, 'plugins': [], 'theme': 'active',
+                                  'sources': {'themes': {'active': same}}})
+            with self.subTest(tag=tag), contextlib.ExitStack() as stack:
+                self._patch_logs(stack)
+                stack.enter_context(mock.patch.object(mt.MTDatabase, 'is_initialized', return_value=True))
+                stack.enter_context(mock.patch.object(mt.MTFunctions, 'load_config', return_value={'shared_root': self.tmp}))
+                stack.enter_context(mock.patch.object(mt.WOMultitenancyController, '_persist_baseline_version'))
+                fetch = stack.enter_context(mock.patch.object(
+                    mt.SharedInfrastructure, 'download_theme_from_github', side_effect=download))
+                stack.enter_context(mock.patch.object(mt.SharedInfrastructure, 'git_commit_baseline', return_value=True))
+                ctrl.add_theme()
+                baseline = self._read_baseline()
+                self.assertEqual(baseline['version'], expected_version)
+                self.assertEqual(fetch.called, tag != 'v1')
+                self.assertEqual(baseline['sources']['themes']['active']['ref'], tag)
+
+    def test_set_theme_same_theme_skips_write_and_commit(self):
+        if mt is None:
+            self.skipTest(f'multitenancy controller import unavailable: {_mt_import_error}')
+        self._write_baseline({'version': 4, 'plugins': [], 'theme': 'active'})
+        os.makedirs(os.path.join(self.tmp, 'wp-content', 'themes', 'active'))
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        pargs = mock.Mock()
+        pargs.theme_slug = 'active'
+        pargs.site_name = None
+        ctrl.app = mock.Mock()
+        ctrl.app.pargs = pargs
+
+        for apply_now in (False, True):
+            pargs.apply_now = apply_now
+            with self.subTest(apply_now=apply_now), contextlib.ExitStack() as stack:
+                self._patch_logs(stack)
+                stack.enter_context(mock.patch.object(mt.MTDatabase, 'is_initialized', return_value=True))
+                stack.enter_context(mock.patch.object(mt.MTFunctions, 'load_config', return_value={'shared_root': self.tmp}))
+                write = stack.enter_context(mock.patch.object(mt.MTFunctions, 'write_baseline'))
+                commit = stack.enter_context(mock.patch.object(mt.SharedInfrastructure, 'git_commit_baseline'))
+                apply_sites = stack.enter_context(mock.patch.object(
+                    mt.BaselineApplicator, 'apply_baseline_to_sites'))
+                ctrl.set_theme()
+
+            write.assert_not_called()
+            commit.assert_not_called()
+            if apply_now:
+                apply_sites.assert_called_once_with(ctrl, {'shared_root': self.tmp}, 4)
+            else:
+                apply_sites.assert_not_called()
+        self.assertEqual(self._read_baseline()['version'], 4)
+
 class CoreDatabaseSafetyTests(unittest.TestCase):
     """Focused tests for schema-gated tenant database safety."""
 
@@ -4322,7 +5129,7 @@ $wp_version = '6.9.1';
                 mock.patch.object(
                     mt.MTFunctions,
                     'backup_tenant_databases',
-                    side_effect=lambda app, sites, root: (
+                    side_effect=lambda app, sites, root, workers=1: (
                         order.append('dumps') or backups
                     ),
                 )
@@ -4578,7 +5385,8 @@ $wp_version = '6.9.1';
             sites=sites,
         )
 
-        self.assertEqual(order, [
+        flip_end = order.index('record') + 1
+        self.assertEqual(order[:flip_end], [
             'nginx-capture',
             'gate:one.example',
             'gate:two.example',
@@ -4600,14 +5408,21 @@ $wp_version = '6.9.1';
             'dumps',
             'flip',
             'record',
-            'upgrade',
-            'ungate:one.example',
-            'unlock:one.example',
-            'upgrade',
-            'ungate:two.example',
-            'unlock:two.example',
-            'reload',
         ])
+        # Upgrades finish in any order; each site's bookkeeping follows its
+        # own result and the batch ungate reload comes last.
+        tail = order[flip_end:]
+        self.assertEqual(sorted(tail), sorted([
+            'upgrade', 'upgrade',
+            'ungate:one.example', 'unlock:one.example',
+            'ungate:two.example', 'unlock:two.example',
+            'reload',
+        ]))
+        self.assertEqual(tail[0], 'upgrade')
+        self.assertEqual(tail[-1], 'reload')
+        for domain in ('one.example', 'two.example'):
+            self.assertEqual(tail.index(f'unlock:{domain}'),
+                             tail.index(f'ungate:{domain}') + 1)
         self.assertEqual(order.count('reload'), 4)
         bypass_values = [
             call.kwargs.get('loopback_bypass')
@@ -5226,6 +6041,26 @@ class ReleaseRetentionTests(unittest.TestCase):
             manager.cleanup_old_releases(keep_count=0)
         self.assertIn('wp-3', os.listdir(self.releases))
 
+    def test_list_releases_reuses_scan_until_directory_changes(self):
+        manager = mtf.ReleaseManager(mock.Mock(), self.tmp)
+        open(os.path.join(self.releases, 'wp-stray.txt'), 'w').close()
+        with mock.patch('wo.cli.plugins.multitenancy_functions.os.scandir',
+                        wraps=os.scandir) as scandir:
+            first = manager.list_releases()
+            self.assertEqual(manager.get_previous_release('wp-3'), 'wp-2')
+            self.assertEqual(scandir.call_count, 1)
+            first.clear()
+            self.assertEqual(manager.list_releases()[0], 'wp-5')
+
+        os.rmdir(os.path.join(self.releases, 'wp-5'))
+        os.utime(self.releases, ns=(0, 0))
+        self.assertEqual(manager.list_releases(),
+                         ['wp-4', 'wp-3', 'wp-2', 'wp-1'])
+
+    def test_list_releases_missing_directory_is_empty(self):
+        manager = mtf.ReleaseManager(mock.Mock(), os.path.join(self.tmp, 'none'))
+        self.assertEqual(manager.list_releases(), [])
+
 
 class RejectExtraPositionalsTests(unittest.TestCase):
     """Stray positionals (e.g. a pasted em dash) must error out (G.2)."""
@@ -5315,16 +6150,644 @@ class BaselineRollbackMintTests(unittest.TestCase):
             stack.enter_context(mock.patch.object(
                 mt.MTFunctions, 'load_config',
                 return_value={'shared_root': self.tmp}))
+            run = stack.enter_context(mock.patch.object(
+                mt.subprocess, 'run', wraps=subprocess.run))
             ctrl.baseline_rollback()
 
+        # log --stat lookup, show <commit>:path, commit -- path.
+        self.assertEqual(
+            [next(arg for arg in call.args[0][1:] if not arg.startswith('-'))
+             for call in run.call_args_list],
+            ['log', 'show', 'commit'])
+        # --force: nobody reads the preview, so --stat is not computed.
+        self.assertNotIn('--stat', run.call_args_list[0].args[0])
+        # The --grep selects the commit; no pathspec-driven diffing.
+        self.assertNotIn('config/baseline.json', run.call_args_list[0].args[0])
+        self.assertEqual(self._git('status', '--porcelain').stdout, '')
+
         with open(self.baseline_file) as fh:
             rolled = json.load(fh)
         # Pre-rollback version was 2 -> minted version is 3, with v1 content.
         self.assertEqual(rolled['version'], 3)
         self.assertEqual(rolled['plugins'], ['alpha'])
+        self.assertRegex(rolled['generated'],
+                         r'^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\dZ$')
         log_out = self._git('log', '--format=%s', '-1').stdout.strip()
         self.assertEqual(log_out, 'Baseline v3: Rollback to v1 content')
 
+    def test_history_lists_baseline_commits_like_oneline_decorate(self):
+        if mt is None:
+            self.skipTest(
+                f'multitenancy controller import unavailable: {_mt_import_error}')
+        if shutil.which('git') is None:
+            self.skipTest('git not on PATH')
+        self._git('init')
+        self._git('config', 'user.email', 'test@example.invalid')
+        self._git('config', 'user.name', 'Test')
+        self._write_and_commit(1, ['alpha'])
+        self._write_and_commit(2, ['alpha', 'beta'])
+        expected = self._git('log', '--oneline', '--decorate', '-20',
+                             'config/baseline.json').stdout.strip()
+
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        ctrl.app = mock.Mock()
+        with mock.patch('wo.core.logging.Log.info') as info, \
+                mock.patch('wo.core.logging.Log.error') as error, \
+                mock.patch.object(mt.MTDatabase, 'is_initialized', return_value=True), \
+                mock.patch.object(mt.MTFunctions, 'load_config',
+                                  return_value={'shared_root': self.tmp}):
+            ctrl.history()
+
+        error.assert_not_called()
+        lines = [call.args[1] for call in info.call_args_list]
+        start = lines.index(expected.splitlines()[0])
+        self.assertEqual(lines[start:start + 2], expected.splitlines())
+        # The footer is a single multi-line record after the log lines.
+        self.assertTrue(lines[-1].startswith('=' * 60 + '\n'))
+        self.assertIn('View full history:', lines[-1])
+
+    def test_history_and_rollback_report_missing_git_without_preflight(self):
+        if mt is None:
+            self.skipTest(
+                f'multitenancy controller import unavailable: {_mt_import_error}')
+        if shutil.which('git') is None:
+            self.skipTest('git not on PATH')
+        with open(self.baseline_file, 'w') as fh:
+            json.dump({'version': 2}, fh)
+
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        ctrl.app = mock.Mock()
+        ctrl.app.pargs.to_version = 1
+        for command in (ctrl.history, ctrl.baseline_rollback):
+            with self.subTest(command=command.__name__), \
+                    mock.patch('wo.core.logging.Log.info'), \
+                    mock.patch('wo.core.logging.Log.warn'), \
+                    mock.patch('wo.core.logging.Log.error',
+                               side_effect=SystemExit) as error, \
+                    mock.patch.object(mt.os.path, 'exists',
+                                      wraps=os.path.exists) as exists, \
+                    mock.patch.object(mt.MTDatabase, 'is_initialized', return_value=True), \
+                    mock.patch.object(mt.MTFunctions, 'load_config',
+                                      return_value={'shared_root': self.tmp}):
+                with self.assertRaises(SystemExit):
+                    command()
+            self.assertNotIn(mock.call(os.path.join(self.tmp, '.git')),
+                             exists.call_args_list)
+            self.assertEqual(error.call_args.args[1], 'Git tracking not initialized')
+
+    def test_git_commit_baseline_commits_in_one_git_call_once_tracked(self):
+        if shutil.which('git') is None:
+            self.skipTest('git not on PATH')
+        self._git('init')
+        self._git('config', 'user.email', 'test@example.invalid')
+        self._git('config', 'user.name', 'Test')
+        infra = SharedInfrastructure(mock.Mock(), self.tmp)
+        with open(self.baseline_file, 'w') as fh:
+            json.dump({'version': 1}, fh)
+
+        with mock.patch.object(mtf.subprocess, 'run', wraps=subprocess.run) as run:
+            self.assertTrue(infra.git_commit_baseline('Baseline v1: init'))
+        # Untracked: commit, add, commit.
+        self.assertEqual(run.call_count, 3)
+
+        with open(self.baseline_file, 'w') as fh:
+            json.dump({'version': 2}, fh)
+        with mock.patch.object(mtf.subprocess, 'run', wraps=subprocess.run) as run:
+            self.assertTrue(infra.git_commit_baseline('Baseline v2: bump'))
+            self.assertTrue(infra.git_commit_baseline('Baseline v2: again'))
+        self.assertEqual(run.call_count, 2)
+        self.assertEqual(self._git('log', '--format=%s').stdout.split('\n')[:2],
+                         ['Baseline v2: bump', 'Baseline v1: init'])
+
+
+
+def _memory_db_session():
+    """Return a scoped session over a fresh in-memory tracking database."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import scoped_session, sessionmaker
+    from wo.core.database import Base
+    import wo.cli.plugins.multitenancy_db  # noqa: F401  (registers tables)
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(bind=engine)
+    return scoped_session(sessionmaker(autocommit=False, autoflush=False,
+                                       bind=engine))
+
+
+class ValidateTests(unittest.TestCase):
+    """`wo multitenancy validate` against a real (in-memory) tracking DB."""
+
+    def setUp(self):
+        if mt is None:
+            self.skipTest(f"multitenancy controller import unavailable: {_mt_import_error}")
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        os.makedirs(os.path.join(self.tmp, 'config'))
+        os.makedirs(os.path.join(self.tmp, 'wp-content', 'plugins', 'alpha'))
+        with open(os.path.join(self.tmp, 'config', 'baseline.json'), 'w') as fh:
+            json.dump({'version': 3, 'plugins': ['alpha'], 'theme': None}, fh)
+        self.session = _memory_db_session()
+        self.addCleanup(self.session.remove)
+
+    def _add_sites(self, versions, **fields):
+        from wo.cli.plugins.multitenancy_db import MultitenancySite
+        for i, version in enumerate(versions):
+            self.session.add(MultitenancySite(
+                domain=f'site{i}.example.com', baseline_version=version,
+                **fields))
+        self.session.commit()
+
+    def _run_validate(self):
+        ctrl = mt.WOMultitenancyController.__new__(mt.WOMultitenancyController)
+        ctrl.app = mock.Mock()
+        with contextlib.ExitStack() as stack:
+            logs = {
+                name: stack.enter_context(mock.patch(f'wo.core.logging.Log.{name}'))
+                for name in ('info', 'warn', 'error', 'debug')
+            }
+            stack.enter_context(mock.patch.object(
+                mt.MTDatabase, 'is_initialized', return_value=True))
+            stack.enter_context(mock.patch.object(
+                mt.MTFunctions, 'load_config',
+                return_value={'shared_root': self.tmp}))
+            stack.enter_context(mock.patch('wo.core.database.db_session', self.session))
+            stack.enter_context(mock.patch(
+                'wo.cli.plugins.multitenancy_db.db_session', self.session))
+            ctrl.validate()
+        return logs
+
+    @staticmethod
+    def _messages(log_mock):
+        return [call.args[1] for call in log_mock.call_args_list]
+
+    def test_outdated_sites_report_is_a_single_write(self):
+        self._add_sites([1] * 12 + [3])
+        logs = self._run_validate()
+        reports = [m for m in self._messages(logs['warn']) if 'behind baseline' in m]
+        self.assertEqual(len(reports), 1)
+        report = reports[0]
+        self.assertTrue(report.startswith('⚠️  12 site(s) behind baseline:'))
+        self.assertEqual(report.count('should be 3'), 10)
+        self.assertIn('... and 2 more', report)
+        self.assertTrue(report.endswith('Run: wo multitenancy apply'))
+
+    def test_null_site_version_counts_as_outdated(self):
+        self._add_sites([None, 3])
+        logs = self._run_validate()
+        reports = [m for m in self._messages(logs['warn']) if 'behind baseline' in m]
+        self.assertEqual(len(reports), 1)
+        self.assertIn('site0.example.com (version 0, should be 3)', reports[0])
+
+    def test_empty_fleet_skips_version_check(self):
+        logs = self._run_validate()
+        info = self._messages(logs['info'])
+        self.assertIn('No production sites tracked', info)
+        self.assertIn('✅ VALIDATION PASSED: Baseline is healthy', info)
+
+    def test_outdated_rows_are_filtered_in_sql(self):
+        self._add_sites([3] * 5 + [2, None])
+        from wo.cli.plugins.multitenancy_db import MultitenancySite
+        self.session.add(MultitenancySite(
+            domain='disabled.example.com', baseline_version=1, is_enabled=False))
+        self.session.commit()
+        statements = []
+        from sqlalchemy import event
+        engine = self.session.get_bind()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, 'before_cursor_execute', listener)
+        self.addCleanup(event.remove, engine, 'before_cursor_execute', listener)
+        logs = self._run_validate()
+        report = [m for m in self._messages(logs['warn']) if 'behind baseline' in m][0]
+        self.assertTrue(report.startswith('⚠️  2 site(s) behind baseline:'))
+        self.assertNotIn('disabled.example.com', report)
+        self.assertEqual(len(statements), 1)
+        self.assertIn('LIMIT', statements[0])
+
+    def test_plugin_checks_keep_baseline_order(self):
+        os.makedirs(os.path.join(self.tmp, 'wp-content', 'plugins', 'gamma'))
+        with open(os.path.join(self.tmp, 'config', 'baseline.json'), 'w') as fh:
+            json.dump({'version': 3, 'plugins': ['gamma', 'beta', 'alpha'],
+                       'theme': None}, fh)
+        logs = self._run_validate()
+        sections = [m for m in self._messages(logs['warn'])
+                    if m.startswith('Plugin Validation:')]
+        self.assertEqual(sections, ['Plugin Validation:\n'
+                                    '   ✅ gamma\n'
+                                    '   ❌ beta - NOT FOUND ON DISK\n'
+                                    '   ✅ alpha\n'])
+        self.assertIn('1 plugin(s) missing', logs['error'].call_args[0][1])
+
+    def test_up_to_date_fleet_passes(self):
+        self._add_sites([3, 3])
+        logs = self._run_validate()
+        self.assertIn('✅ All 2 production sites up to date', self._messages(logs['info']))
+        self.assertIn('Plugin Validation:\n   ✅ alpha\n', self._messages(logs['info']))
+        self.assertIn('✅ VALIDATION PASSED: Baseline is healthy', self._messages(logs['info']))
+
+
+
+class MTDatabaseTests(unittest.TestCase):
+    """MTDatabase helpers against a real (in-memory) tracking DB."""
+
+    def setUp(self):
+        from wo.cli.plugins import multitenancy_db as mtdb
+        self.mtdb = mtdb
+        self.session = _memory_db_session()
+        self.addCleanup(self.session.remove)
+        patcher = mock.patch.object(mtdb, 'db_session', self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in ('info', 'warn', 'error', 'debug'):
+            log_patcher = mock.patch(f'wo.core.logging.Log.{name}')
+            log_patcher.start()
+            self.addCleanup(log_patcher.stop)
+        self.app = mock.Mock()
+
+    def _site(self, domain):
+        return self.session.query(self.mtdb.MultitenancySite).filter_by(
+            domain=domain).one()
+
+    def test_updates_refresh_updated_at_through_onupdate(self):
+        import datetime as _dt
+        self.mtdb.MTDatabase.add_shared_site(self.app, 'a.example.com', {})
+        site = self._site('a.example.com')
+        stale = _dt.datetime(2000, 1, 1)
+        site.updated_at = stale
+        self.session.commit()
+
+        self.assertTrue(self.mtdb.MTDatabase.update_site_baseline(
+            self.app, 'a.example.com', 7))
+        site = self._site('a.example.com')
+        self.assertEqual(site.baseline_version, 7)
+        self.assertFalse(self.mtdb.MTDatabase.update_site_baseline(
+            self.app, 'missing.example.com', 7))
+        self.assertGreater(site.updated_at, stale)
+
+
+    def test_domain_lookups_select_columns_not_rows(self):
+        MTDatabase = self.mtdb.MTDatabase
+        MTDatabase.add_shared_site(self.app, 'a.example.com', {
+            'redis_prefix': 'a_example_com_'})
+        self.session.expunge_all()
+
+        self.assertTrue(MTDatabase.is_shared_site(self.app, 'a.example.com'))
+        self.assertFalse(MTDatabase.is_shared_site(self.app, 'b.example.com'))
+        self.assertEqual(
+            MTDatabase.get_redis_prefix(self.app, 'a.example.com'), 'a_example_com_')
+        self.assertIsNone(MTDatabase.get_redis_prefix(self.app, 'b.example.com'))
+        self.assertEqual(len(self.session.identity_map), 0)
+
+    def test_redis_lookups_read_plain_rows(self):
+        MTDatabase = self.mtdb.MTDatabase
+        MTDatabase.add_shared_site(self.app, 'a.example.com', {
+            'redis_prefix': 'a_example_com_', 'redis_db': 1})
+        MTDatabase.add_shared_site(self.app, 'b.example.com', {})
+        self.session.expunge_all()
+
+        self.assertEqual(MTDatabase.get_all_redis_prefixes(self.app),
+                         {'a.example.com': 'a_example_com_'})
+        self.assertEqual(MTDatabase.check_redis_prefix_exists(
+            self.app, 'a_example_com_'), 'a.example.com')
+        self.assertIsNone(MTDatabase.check_redis_prefix_exists(self.app, 'zz_'))
+        self.assertEqual(MTDatabase.allocate_redis_db(self.app, 'a.example.com'), 1)
+        self.assertEqual(MTDatabase.allocate_redis_db(self.app, 'b.example.com'), 2)
+        self.assertEqual(len(self.session.identity_map), 0)
+
+    def test_set_redis_prefix_is_a_single_update(self):
+        from sqlalchemy import event
+        MTDatabase = self.mtdb.MTDatabase
+        MTDatabase.add_shared_site(self.app, 'a.example.com', {})
+        statements = []
+
+        def _record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = self.session.get_bind()
+        event.listen(engine, 'before_cursor_execute', _record)
+        self.addCleanup(event.remove, engine, 'before_cursor_execute', _record)
+
+        self.assertTrue(MTDatabase.set_redis_prefix(
+            self.app, 'a.example.com', 'a_example_com_'))
+        self.assertFalse(MTDatabase.set_redis_prefix(
+            self.app, 'b.example.com', 'b_example_com_'))
+        self.assertEqual(len(statements), 2)
+        self.assertTrue(all(s.lstrip().upper().startswith('UPDATE') for s in statements))
+        self.assertEqual(
+            MTDatabase.get_redis_prefix(self.app, 'a.example.com'), 'a_example_com_')
+
+    def test_narrowed_handlers_keep_fallbacks_but_not_interrupts(self):
+        MTDatabase = self.mtdb.MTDatabase
+        MTDatabase.save_config(self.app, {'baseline_version': 'garbage'})
+        self.assertEqual(MTDatabase.get_baseline_version(self.app), 1)
+        with mock.patch.object(MTDatabase, 'get_config',
+                               side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                MTDatabase.is_initialized(self.app)
+            with self.assertRaises(KeyboardInterrupt):
+                MTDatabase.get_baseline_version(self.app)
+
+    def test_add_shared_site_inserts_then_updates_only_given_columns(self):
+        MTDatabase = self.mtdb.MTDatabase
+        MTDatabase.add_shared_site(self.app, 'a.example.com', {
+            'site_path': '/var/www/a.example.com', 'php_version': '8.3',
+            'cache_type': 'wpfc', 'redis_prefix': 'a_example_com_',
+            'is_shared': True,
+        })
+        MTDatabase.add_shared_site(self.app, 'a.example.com', {'redis_db': 5, 'is_ssl': True})
+
+        site = self._site('a.example.com')
+        self.assertEqual(site.php_version, '8.3')
+        self.assertEqual(site.cache_type, 'wpfc')
+        self.assertEqual(site.redis_prefix, 'a_example_com_')
+        self.assertEqual(site.redis_db, 5)
+        self.assertTrue(site.is_ssl)
+        self.assertEqual(
+            self.session.query(self.mtdb.MultitenancySite).count(), 1)
+
+    def test_core_engine_pools_and_opens_sqlite_in_wal_mode(self):
+        import sqlite3
+        from wo.core import database
+        self.assertIsInstance(database.engine.pool, database.QueuePool)
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        conn = sqlite3.connect(os.path.join(tmp, 'dbase.db'))
+        self.addCleanup(conn.close)
+        database._sqlite_pragmas(conn, None)
+        self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        self.assertEqual(conn.execute('PRAGMA synchronous').fetchone()[0], 1)
+        self.assertEqual(conn.execute('PRAGMA temp_store').fetchone()[0], 2)
+
+    def test_core_engine_optimizes_on_close_and_tolerates_failures(self):
+        from wo.core import database
+        conn = mock.Mock()
+        database._sqlite_optimize(conn, None)
+        conn.cursor.return_value.execute.assert_called_once_with('PRAGMA optimize')
+        conn.cursor.return_value.close.assert_called_once_with()
+
+        conn.cursor.return_value.execute.side_effect = Exception('readonly')
+        database._sqlite_optimize(conn, None)
+        self.assertEqual(conn.cursor.return_value.close.call_count, 2)
+
+    def test_core_engine_exit_hook_closes_the_session_connection(self):
+        from sqlalchemy import create_engine, event, text
+        from sqlalchemy.orm import scoped_session, sessionmaker
+        from wo.core import database
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'dbase.db')}",
+                               poolclass=database.QueuePool, pool_size=1)
+        closed = []
+        event.listen(engine, 'close', lambda *args: closed.append(args))
+        session = scoped_session(sessionmaker(bind=engine))
+        session.execute(text('SELECT 1'))
+
+        with mock.patch.object(database, 'engine', engine), \
+                mock.patch.object(database, 'db_session', session):
+            database._close_connections()
+        self.assertEqual(len(closed), 1)
+
+    def test_save_config_and_update_release_upsert_in_one_statement_each(self):
+        import datetime as _dt
+        from sqlalchemy import event
+        MTDatabase = self.mtdb.MTDatabase
+        Config = self.mtdb.MultitenancyConfig
+        MTDatabase.save_config(self.app, {'shared_root': '/srv', 'baseline_version': 1})
+        stale = _dt.datetime(2000, 1, 1)
+        self.session.query(Config).update({'updated_at': stale})
+        self.session.commit()
+
+        statements = []
+        engine = self.session.get_bind()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            self.assertTrue(MTDatabase.save_config(
+                self.app, {'shared_root': '/srv', 'baseline_version': 2}))
+        finally:
+            event.remove(engine, 'before_cursor_execute', listener)
+        self.assertEqual(len(statements), 1)
+        self.assertIn('ON CONFLICT', statements[0])
+        rows = {c.key: c for c in self.session.query(Config).all()}
+        self.assertEqual(rows['baseline_version'].value, '2')
+        self.assertGreater(rows['baseline_version'].updated_at, stale)
+        # Unchanged values are not rewritten.
+        self.assertEqual(rows['shared_root'].updated_at, stale)
+        self.assertEqual(rows['initialized'].updated_at, stale)
+
+        for name in ('wp-1', 'wp-2', 'wp-1'):
+            self.assertTrue(MTDatabase.update_release(self.app, name))
+            self.assertEqual(MTDatabase.get_current_release(self.app), name)
+            self.assertEqual(MTDatabase.get_config(self.app, 'current_release'), name)
+        releases = self.session.query(self.mtdb.MultitenancyRelease).all()
+        self.assertEqual(sorted((r.release_name, r.is_current) for r in releases),
+                         [('wp-1', True), ('wp-2', False)])
+
+    def test_config_reads_are_memoized_per_session_and_cleared_on_write(self):
+        from sqlalchemy import event
+        MTDatabase = self.mtdb.MTDatabase
+        self.assertFalse(MTDatabase.is_initialized(self.app))
+        MTDatabase.save_config(self.app, {'baseline_version': 4})
+
+        statements = []
+        engine = self.session.get_bind()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            for _ in range(3):
+                self.assertTrue(MTDatabase.is_initialized(self.app))
+                self.assertEqual(MTDatabase.get_baseline_version(self.app), 4)
+            self.assertEqual(len(statements), 2)
+
+            MTDatabase.save_config(self.app, {'baseline_version': 5})
+            self.assertEqual(MTDatabase.get_baseline_version(self.app), 5)
+        finally:
+            event.remove(engine, 'before_cursor_execute', listener)
+
+        self.session.remove()
+        self.assertNotIn('mt_config', self.session.info)
+
+    def test_get_stats_aggregates_in_sql(self):
+        MTDatabase = self.mtdb.MTDatabase
+        self.assertEqual(MTDatabase.get_stats(self.app), {
+            'total_sites': 0, 'enabled_sites': 0, 'ssl_sites': 0,
+            'total_releases': 0, 'php_distribution': {},
+            'cache_distribution': {},
+        })
+        Site = self.mtdb.MultitenancySite
+        self.session.add_all([
+            Site(domain='a.example.com', php_version='8.3', cache_type='wpfc',
+                 is_ssl=True),
+            Site(domain='b.example.com', php_version='8.3', cache_type='',
+                 is_enabled=False),
+            Site(domain='c.example.com', php_version=None, cache_type=None),
+        ])
+        self.session.commit()
+        MTDatabase.update_release(self.app, 'wp-1')
+        statements = []
+        from sqlalchemy import event
+        engine = self.session.get_bind()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, 'before_cursor_execute', listener)
+        self.addCleanup(event.remove, engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(MTDatabase.get_stats(self.app), {
+            'total_sites': 3, 'enabled_sites': 2, 'ssl_sites': 1,
+            'total_releases': 1,
+            'php_distribution': {'8.3': 2, 'unknown': 1},
+            'cache_distribution': {'wpfc': 1, 'none': 2},
+        })
+        self.assertEqual(len(statements), 2)
+
+    def test_get_shared_sites_returns_plain_dicts_without_orm_rows(self):
+        MTDatabase = self.mtdb.MTDatabase
+        MTDatabase.add_shared_site(self.app, 'a.example.com', {
+            'php_version': '8.3', 'redis_db': 3})
+        self.session.expunge_all()
+
+        sites = MTDatabase.get_shared_sites(self.app)
+        self.assertEqual(len(sites), 1)
+        self.assertEqual(set(sites[0]), set(MTDatabase._SITE_DICT_COLUMNS))
+        self.assertEqual(sites[0]['domain'], 'a.example.com')
+        self.assertEqual(sites[0]['php_version'], '8.3')
+        self.assertEqual(sites[0]['redis_db'], 3)
+        self.assertIs(sites[0]['is_enabled'], True)
+        self.assertEqual(len(self.session.identity_map), 0)
+
+    def test_status_snapshot_matches_individual_getters(self):
+        MTDatabase = self.mtdb.MTDatabase
+        self.assertFalse(MTDatabase.get_status_snapshot(self.app)['initialized'])
+
+        MTDatabase.save_config(self.app, {
+            'current_release': 'wp-1', 'baseline_version': 3})
+        MTDatabase.add_shared_site(self.app, 'a.example.com', {'php_version': '8.3'})
+        snapshot = MTDatabase.get_status_snapshot(self.app)
+
+        self.assertTrue(snapshot['initialized'])
+        self.assertEqual(snapshot['current_release'],
+                         MTDatabase.get_current_release(self.app))
+        self.assertEqual(snapshot['baseline_version'], 3)
+        self.assertEqual(snapshot['shared_sites'],
+                         MTDatabase.get_shared_sites(self.app))
+
+    def test_initialize_tables_only_creates_what_is_missing(self):
+        from sqlalchemy import event, text
+        MTDatabase = self.mtdb.MTDatabase
+        MTDatabase.initialize_tables(self.app)
+        names = set(self.session.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+        self.assertTrue({name for name, _ in self.mtdb._INDEXES} <= names)
+
+        statements = []
+        engine = self.session.get_bind()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            MTDatabase.initialize_tables(self.app)
+        finally:
+            event.remove(engine, 'before_cursor_execute', listener)
+        self.assertEqual(len(statements), 2)
+        self.assertIn('sqlite_master', statements[0])
+        self.assertIn('multitenancy_sites', statements[1])
+
+    def test_initialize_tables_migrates_old_schema(self):
+        from sqlalchemy import event, inspect, text
+        self.session.execute(text('DROP TABLE multitenancy_sites'))
+        self.session.execute(text(
+            'CREATE TABLE multitenancy_sites ('
+            'id INTEGER PRIMARY KEY, domain VARCHAR NOT NULL UNIQUE, '
+            'site_path VARCHAR, is_enabled BOOLEAN, baseline_version INTEGER)'))
+        self.session.commit()
+        engine = self.session.get_bind()
+        statements = []
+        recorder = lambda *args: statements.append(args[2])
+        event.listen(engine, 'before_cursor_execute', recorder)
+        self.addCleanup(event.remove, engine, 'before_cursor_execute', recorder)
+
+        self.mtdb.MTDatabase.initialize_tables(self.app)
+        self.assertIn('PRAGMA optimize=0x10002', statements[-1])
+
+        columns = {c['name'] for c in inspect(engine).get_columns('multitenancy_sites')}
+        self.assertTrue({'redis_prefix', 'redis_db'} <= columns)
+        names = set(self.session.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+        self.assertTrue({name for name, _ in self.mtdb._INDEXES} <= names)
+        # A second run finds nothing left to migrate.
+        statements.clear()
+        self.mtdb.MTDatabase.initialize_tables(self.app)
+        self.assertFalse([s for s in statements if 'ALTER TABLE' in s])
+
+    def test_validation_snapshot_reads_only_the_enabled_index(self):
+        MTDatabase = self.mtdb.MTDatabase
+        MTDatabase.initialize_tables(self.app)
+        for version in (1, 3, None):
+            self.session.add(self.mtdb.MultitenancySite(
+                domain=f'v{version}.example.com', baseline_version=version))
+        self.session.commit()
+        statements = []
+        from sqlalchemy import event
+        engine = self.session.get_bind()
+        listener = lambda *args: statements.append((args[2], args[3]))
+        event.listen(engine, 'before_cursor_execute', listener)
+        snapshot = MTDatabase.get_validation_snapshot(self.app, 3)
+        event.remove(engine, 'before_cursor_execute', listener)
+
+        self.assertEqual(snapshot['total'], 3)
+        self.assertEqual(snapshot['outdated_count'], 2)
+        sql, params = statements[-1]
+        plan = ' '.join(str(row[-1]) for row in self.session.connection()
+                        .exec_driver_sql('EXPLAIN QUERY PLAN ' + sql, params))
+        self.assertIn('COVERING INDEX idx_sites_enabled_baseline', plan)
+
+    def test_current_release_lookup_uses_the_partial_index(self):
+        from sqlalchemy import event
+        MTDatabase = self.mtdb.MTDatabase
+        MTDatabase.initialize_tables(self.app)
+        for name in ('wp-1', 'wp-2'):
+            MTDatabase.update_release(self.app, name)
+        statements = []
+        engine = self.session.get_bind()
+        listener = lambda *args: statements.append((args[2], args[3]))
+        event.listen(engine, 'before_cursor_execute', listener)
+        try:
+            self.assertEqual(MTDatabase.get_current_release(self.app), 'wp-2')
+        finally:
+            event.remove(engine, 'before_cursor_execute', listener)
+
+        sql, params = statements[0]
+        plan = ' '.join(str(row[-1]) for row in self.session.connection()
+                        .exec_driver_sql('EXPLAIN QUERY PLAN ' + sql, params))
+        self.assertIn('idx_mt_release_current', plan)
+
+    def test_cleanup_empties_tables_and_forgets_memoized_config(self):
+        MTDatabase = self.mtdb.MTDatabase
+        MTDatabase.save_config(self.app, {'baseline_version': 2})
+        MTDatabase.update_release(self.app, 'wp-1')
+        MTDatabase.add_shared_site(self.app, 'a.example.com', {})
+        self.assertTrue(MTDatabase.is_initialized(self.app))
+
+        MTDatabase.cleanup(self.app)
+
+        self.assertFalse(MTDatabase.is_initialized(self.app))
+        self.assertIsNone(MTDatabase.get_current_release(self.app))
+        self.assertEqual(MTDatabase.get_shared_sites(self.app), [])
+
+    def test_delete_sites_removes_rows_in_chunks(self):
+        MTDatabase = self.mtdb.MTDatabase
+        domains = [f's{i}.example.com' for i in range(5)]
+        for domain in domains:
+            MTDatabase.add_shared_site(self.app, domain, {})
+
+        with mock.patch.object(self.mtdb, 'SQL_IN_CHUNK', 2):
+            removed = MTDatabase.delete_sites(
+                self.app, domains[:3] + ['missing.example.com'])
+
+        self.assertEqual(removed, 3)
+        self.assertEqual(
+            sorted(d for (d,) in self.session.query(
+                self.mtdb.MultitenancySite.domain)),
+            domains[3:])
+        self.assertTrue(MTDatabase.remove_shared_site(self.app, domains[3]))
+        self.assertFalse(MTDatabase.remove_shared_site(self.app, domains[3]))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -285,6 +285,27 @@ class MultitenancyBackupTests(unittest.TestCase):
             },
         )
 
+    def test_quarantine_entries_reads_manifests_for_displayed_entries_only(self):
+        from wo.cli.plugins import multitenancy_backup_status as backup_status
+
+        for index in range(4):
+            os.makedirs(os.path.join(self.tmp, "site%d.example.com-op" % index))
+        open(os.path.join(self.tmp, "stray-file"), "w").close()
+        with mock.patch.object(
+            backup_status, "_read_operation_id", return_value="op-1"
+        ) as read_id:
+            entries, total = backup_status._quarantine_entries(self.tmp, limit=2)
+        self.assertEqual(total, 4)
+        self.assertEqual(
+            entries,
+            [("site0.example.com-op", "op-1"), ("site1.example.com-op", "op-1")],
+        )
+        self.assertEqual(read_id.call_count, 2)
+        self.assertEqual(
+            backup_status._quarantine_entries(os.path.join(self.tmp, "missing")),
+            ([], 0),
+        )
+
 
 def stat_mode(path):
     return os.stat(path).st_mode & 0o777
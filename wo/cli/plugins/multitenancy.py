@@ -2,41 +2,55 @@
 Enables WordPress multi-tenancy with shared core files for efficient management.
 """
 
+import contextlib
 import os
+import re
 import sys
 import json
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from cement.core.controller import CementBaseController, expose
 from wo.cli.plugins.site_functions import (
-    check_domain_exists, setupdatabase, setwebrootpermissions,
-    site_package_check, sitebackup, pre_run_checks
+    check_domain_exists, deleteDB, deleteWebRoot, removeNginxConf,
+    setupdatabase, site_package_check
 )
 from wo.cli.plugins.sitedb import (
-    addNewSite, deleteSiteInfo, getAllsites, getSiteInfo, renameSiteInfo,
-    updateSiteInfo
+    addNewSite, deleteSiteInfo, getSiteInfo, renameSiteInfo, updateSiteInfo
 )
+from wo.core.acme import WOAcme
 from wo.core.domainvalidate import WODomain
-from wo.core.fileutils import WOFileUtils
 from wo.core.git import WOGit
 from wo.core.logging import Log
-from wo.core.services import WOService
-from wo.core.shellexec import WOShellExec, CommandExecutionError
-from wo.core.sslutils import SSL
 from wo.core.variables import WOVar
-from wo.core.acme import WOAcme
 from wo.cli.plugins.multitenancy_functions import (
     MTFunctions, SharedInfrastructure, ReleaseManager, BaselineApplicator,
     create_shared_config_file, edit_shared_config,
 )
-from wo.cli.plugins.multitenancy_db import MTDatabase
-from wo.cli.plugins.multitenancy_health import HealthChecker, render_text as render_health_text
+from wo.cli.plugins.multitenancy_db import MTDatabase, SQL_IN_CHUNK
 from wo.cli.plugins.multitenancy_backup_functions import (
     fleet_operation, write_tombstone, repair_backup_cron
 )
 
 
+# Resolved on first use, then reused so bulk deletes skip a $PATH scan per
+# `wo site delete`; commands that never shell out to wo never scan $PATH.
+_WO_BIN = None
+
+
+def _wo_bin():
+    global _WO_BIN
+    if _WO_BIN is None:
+        _WO_BIN = shutil.which('wo') or 'wo'
+    return _WO_BIN
+
+
+def _chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
 def wo_multitenancy_hook(app):
     """Hook to initialize multitenancy database tables"""
     from wo.core.database import init_db
@@ -106,6 +120,59 @@ def _reject_extra_positionals(controller, pargs,
                   f"unrecognized arguments: {' '.join(extras)}{hint}")
 
 
+# Plugin/theme directory names: no path separators, dots or whitespace.
+_SLUG_RE = re.compile(r'^[a-z0-9][a-z0-9_-]*$')
+
+
+def _baseline_source(kind, slug, github_repo=None, url=None, branch=None,
+                     tag=None):
+    """Validate an add-plugin/add-theme source before anything is fetched.
+
+    Returns ``(source_info, download, record)``: the human-readable origin,
+    a callable taking a SharedInfrastructure that downloads ``slug``, and
+    the baseline.json ``sources`` entry. Raises ValueError on bad input.
+    """
+    if not _SLUG_RE.match(slug):
+        raise ValueError(
+            f"Invalid {kind} slug '{slug}': use lowercase letters, digits, "
+            "'-' and '_'")
+    if github_repo and url:
+        raise ValueError(
+            "Specify only one source: --github OR --url (default is WordPress.org)")
+    if branch and tag:
+        raise ValueError("Specify only one GitHub ref: --branch OR --tag")
+    if (branch or tag) and not github_repo:
+        raise ValueError("--branch and --tag can only be used with --github")
+
+    if github_repo:
+        ref_type, ref = (('tag', tag) if tag else
+                         ('branch', branch) if branch else ('default', None))
+        source_info = f"from GitHub: {github_repo}"
+        if ref is not None:
+            source_info += f" ({ref_type}: {ref})"
+        record = {'type': 'github', 'repo': github_repo,
+                  'ref_type': ref_type, 'ref': ref}
+
+        def download(infra):
+            return getattr(infra, f'download_{kind}_from_github')(
+                github_repo, slug, branch=branch, tag=tag)
+    elif url:
+        source_info = f"from URL: {url}"
+        record = {'type': 'url', 'url': url}
+
+        def download(infra):
+            return getattr(infra, f'download_{kind}_from_url')(url, slug)
+    else:
+        source_info = "from WordPress.org"
+        record = {'type': 'wordpress', 'version': 'latest'}
+
+        def download(infra):
+            # download_plugin/download_theme return nothing; the caller
+            # checks for the directory instead.
+            return getattr(infra, f'download_{kind}')(slug)
+    return source_info, download, record
+
+
 class _UpdateAbort(Exception):
     """Abort an update before release mutation without generic rollback advice."""
 
@@ -125,6 +192,8 @@ class WOMultitenancyController(CementBaseController):
                 dict(help='New website domain name for rename', nargs='?')),
             (['--force'],
                 dict(help='Force operation without confirmations', action='store_true')),
+            (['-y', '--yes'],
+                dict(help='Answer yes to confirmation prompts', action='store_true', dest='yes')),
             (['--shared'],
                 dict(help='Create site using shared WordPress core', action='store_true')),
             (['--php74'], dict(help='Use PHP 7.4', action='store_true')),
@@ -169,6 +238,8 @@ class WOMultitenancyController(CementBaseController):
             (['--all'], dict(help='Apply operation to every shared site', action='store_true', dest='all_flag')),
             (['--message'], dict(help='Maintenance message shown to visitors', dest='message')),
             (['--verbose'], dict(help='Verbose per-site output', action='store_true', dest='verbose')),
+            (['--domains-file'], dict(help="File listing one domain per line ('-' for stdin)", dest='domains_file')),
+            (['--parallel'], dict(help='Number of sites to delete concurrently', type=int, default=1, dest='parallel')),
         ]
         usage = "wo multitenancy <command> [options]"
     CRON_SYNC_FAILURE_HINT = "cron sync failed; run `wo multitenancy apply` to regenerate /etc/cron.d/wo-multitenancy"
@@ -177,6 +248,21 @@ class WOMultitenancyController(CementBaseController):
         if not MTFunctions.sync_wp_cron_entries(self):
             Log.error(self, self.CRON_SYNC_FAILURE_HINT)
 
+    def _confirm(self, prompt, force, token=None):
+        """Ask for a y/N confirmation; never block on a non-interactive stdin.
+
+        With ``token`` the answer must match it exactly instead of 'y'.
+        """
+        if force:
+            return True
+        if not sys.stdin.isatty():
+            Log.error(self, "Refusing to prompt on non-interactive stdin; "
+                      "pass --yes or --force", exit=False)
+            return False
+        answer = input(prompt).strip()
+        if token is not None:
+            return answer == token
+        return answer.lower() == 'y'
 
     @expose(hide=True)
     def default(self):
@@ -270,6 +356,7 @@ class WOMultitenancyController(CementBaseController):
             }):
                 Log.error(self, "Failed to persist multitenancy "
                                 "configuration to the tracking database")
+            MTFunctions.invalidate_context(self)
             
             if seed_failures:
                 Log.warn(self, "⚠️  Multi-tenancy initialized, but some assets failed to download:")
@@ -295,6 +382,8 @@ class WOMultitenancyController(CementBaseController):
         _reject_extra_positionals(self, pargs)
 
         if not pargs.site_name:
+            if not sys.stdin.isatty():
+                Log.error(self, 'Site name is required when stdin is not a terminal')
             try:
                 while not pargs.site_name:
                     pargs.site_name = input('Enter site name : ').strip()
@@ -320,6 +409,14 @@ class WOMultitenancyController(CementBaseController):
         if not MTFunctions.preflight_shared_config(self, shared_root):
             Log.error(self, "Aborted: wp-config-shared.php failed preflight")
 
+        php_version, cache_type = self._prepare_create_stack()
+        return self._provision_site(
+            wo_domain, config, shared_root, php_version, cache_type)
+
+    def _prepare_create_stack(self):
+        """Resolve PHP/cache flags and install the packages sites need."""
+        pargs = self.app.pargs
+
         # Determine PHP version
         php_version = MTFunctions.get_php_version(self, pargs)
 
@@ -352,6 +449,19 @@ class WOMultitenancyController(CementBaseController):
             site_package_check(self, 'wp')
         finally:
             pargs.wpredis = saved_wpredis
+        return php_version, cache_type
+
+    def _provision_site(self, wo_domain, config, shared_root, php_version,
+                        cache_type, batch=False):
+        """Create one shared-core tenant.
+
+        With batch=True (bulk-create) the nginx reload, git commit and cron
+        sync are left to the caller, and a failure returns False instead of
+        exiting: helpers that would exit through Log.error are called with
+        exit=False and their failures raised here, so Cement is never
+        closed mid-batch.
+        """
+        pargs = self.app.pargs
 
         Log.info(self, f"Creating shared WordPress site: {wo_domain}")
         Log.info(self, f"   PHP version: {php_version}")
@@ -400,8 +510,12 @@ class WOMultitenancyController(CementBaseController):
             # 3. Stored in database via site_data for tracking and debugging
             Log.info(self, "Generating Redis cache prefix...")
             redis_prefix = MTDatabase.generate_redis_prefix(self, wo_domain)
-            redis_db = MTDatabase.allocate_redis_db(self, wo_domain)
-            MTFunctions.ensure_redis_databases(self, redis_db + 1)
+            redis_db = MTDatabase.allocate_redis_db(self, wo_domain,
+                                                    exit=not batch)
+            if redis_db is None:
+                raise Exception("Failed to allocate a Redis database")
+            MTFunctions.ensure_redis_databases(self, redis_db + 1,
+                                               exit=not batch)
             Log.debug(self, f"Redis prefix for {wo_domain}: {redis_prefix} (db {redis_db})")
 
             # A previous site with this exact domain leaves FastCGI page-cache
@@ -447,8 +561,7 @@ class WOMultitenancyController(CementBaseController):
             baseline_complete = True
             if os.path.exists(baseline_path):
                 try:
-                    with open(baseline_path, 'r') as baseline_file:
-                        baseline = json.load(baseline_file)
+                    baseline = MTFunctions.load_baseline_cached(shared_root)
                     if not baseline.get('theme'):
                         Log.warn(
                             self,
@@ -498,43 +611,18 @@ class WOMultitenancyController(CementBaseController):
 
             # Set permissions
             Log.info(self, "Setting permissions...")
-            setwebrootpermissions(self, site_htdocs)
+            MTFunctions.apply_tree_permissions(
+                self, site_htdocs, WOVar.wo_php_user, drop_broken_links=True)
             
-            # Test nginx configuration before enabling site
-            if not MTFunctions.validate_nginx_config_recoverable(self, log_errors=True):
-                raise Exception("Nginx configuration validation failed "
-                                "before enabling site")
-
-            # Enable site in nginx first (without SSL)
-            WOFileUtils.create_symlink(self, [
-                f"/etc/nginx/sites-available/{wo_domain}",
-                f"/etc/nginx/sites-enabled/{wo_domain}"
-            ])
-
-            # Test nginx configuration after enabling site
-            if not MTFunctions.validate_nginx_config_recoverable(self, log_errors=True):
-                # Remove the symlink we just created before failing
-                if os.path.exists(f"/etc/nginx/sites-enabled/{wo_domain}"):
-                    os.remove(f"/etc/nginx/sites-enabled/{wo_domain}")
-                raise Exception("Nginx configuration invalid after enabling site")
-
-            # Reload nginx using our enhanced function
-            try:
-                if not MTFunctions.safe_nginx_reload(self, wo_domain):
-                    raise Exception("Failed to reload nginx "
-                                    "(see diagnostics above)")
-                else:
-                    Log.debug(self, "Nginx reloaded successfully")
-            except Exception as reload_error:
-                Log.error(self, f"Nginx reload error: {reload_error}",
-                          exit=False)
-                # Try to disable the site and reload to restore working state
-                if os.path.exists(f"/etc/nginx/sites-enabled/{wo_domain}"):
-                    os.remove(f"/etc/nginx/sites-enabled/{wo_domain}")
-                    Log.info(self, "Disabled problematic site configuration")
-                    # Try to reload nginx again after disabling the site
-                    MTFunctions.safe_nginx_reload(self, wo_domain)
-                raise Exception("Failed to reload nginx after site creation")
+            # Enable site in nginx first (without SSL); one nginx -t plus
+            # reload covers it, and a failure disables the site again.
+            # Let's Encrypt needs the vhost live, so batches reload then too.
+            MTFunctions.publish_nginx_site(wo_domain)
+            if not MTFunctions.validate_and_reload_nginx(
+                    self, wo_domain,
+                    reload=not batch or pargs.letsencrypt):
+                raise Exception("Failed to enable site in nginx "
+                                "(see diagnostics above)")
             
             # Add to database (WordOps core DB and plugin DB)
             site_data = {
@@ -549,7 +637,7 @@ class WOMultitenancyController(CementBaseController):
                 'redis_prefix': redis_prefix,  # Phase 2: Store Redis prefix with site data
                 'redis_db': redis_db,  # Dedicated Redis database (OCP FLUSHDB isolation)
             }
-            addNewSite(
+            added = addNewSite(
                 self,
                 wo_domain,
                 'wp',
@@ -563,9 +651,12 @@ class WOMultitenancyController(CementBaseController):
                 db_user=db_user,
                 db_password=db_pass,
                 db_host=db_host,
-                php_version=php_version
+                php_version=php_version,
+                exit=not batch
             )
-            MTDatabase.add_shared_site(self, wo_domain, site_data)
+            if not added or not MTDatabase.add_shared_site(
+                    self, wo_domain, site_data, exit=not batch):
+                raise Exception("Failed to record site in the database")
             
             # Configure SSL if requested
             if pargs.letsencrypt:
@@ -573,9 +664,10 @@ class WOMultitenancyController(CementBaseController):
                 ssl_success = MTFunctions.setup_ssl(self, wo_domain, pargs)
                 if ssl_success:
                     # Update database with SSL status
-                    updateSiteInfo(self, wo_domain, ssl=True)
+                    updateSiteInfo(self, wo_domain, ssl=True, exit=not batch)
                     site_data['is_ssl'] = True
-                    MTDatabase.add_shared_site(self, wo_domain, site_data)
+                    MTDatabase.add_shared_site(self, wo_domain, site_data,
+                                               exit=not batch)
                     # Reload nginx again after SSL using our robust function
                     if not MTFunctions.safe_nginx_reload(self, wo_domain):
                         Log.warn(self, "Failed to reload nginx after SSL setup")
@@ -590,13 +682,15 @@ class WOMultitenancyController(CementBaseController):
             # applied site; a partial or failed baseline records 0 so validate
             # flags it and `wo multitenancy apply` re-attempts later.
             MTDatabase.update_site_baseline(
-                self, wo_domain, current_version if baseline_complete else 0
+                self, wo_domain, current_version if baseline_complete else 0,
+                exit=not batch
             )
 
 
             # Git commit
-            WOGit.add(self, ["/etc/nginx"], 
-                     msg=f"Created shared WordPress site: {wo_domain}")
+            if not batch:
+                WOGit.add(self, ["/etc/nginx"], 
+                         msg=f"Created shared WordPress site: {wo_domain}")
             
             # Display success message
             admin_pass = MTFunctions.get_admin_password(self, wo_domain)
@@ -623,8 +717,10 @@ class WOMultitenancyController(CementBaseController):
             Log.info(self, f"   Admin URL: {site_url}/wp-admin")
             Log.info(self, f"   Admin user: {pargs.admin_user}")
             Log.info(self, f"   Admin password: {admin_pass}")
-            self._sync_wp_cron_or_fail()
+            if not batch:
+                self._sync_wp_cron_or_fail()
             Log.info(self, "")
+            return True
 
         except Exception as e:
             Log.info(self, f"site_create_failed target={wo_domain} result=failure")
@@ -639,9 +735,85 @@ class WOMultitenancyController(CementBaseController):
                 Log.info(self, "Cleanup completed")
             except Exception as cleanup_error:
                 Log.warn(self, f"Cleanup failed: {cleanup_error}")
-            Log.error(self, f"Failed to create site: {str(e)}")
+            Log.error(self, f"Failed to create site: {str(e)}", exit=not batch)
+            return False
+
+    @expose(help="Create many shared-core sites listed in --domains-file")
+    @fleet_operation('bulk_create')
+    def bulk_create(self):
+        """Create a batch of tenants behind one nginx reload and git commit"""
+        result = self._bulk_create_impl()
+        if not result:
+            self.app.close(1)
+        return result
+
+    def _bulk_create_impl(self):
+        pargs = self.app.pargs
+
+        if not pargs.domains_file:
+            Log.error(self, "Usage: wo multitenancy bulk-create --domains-file <file|-> [--php84] [--wpfc] ...",
+                      exit=False)
+            return False
+        _reject_extra_positionals(self, pargs, fields=('site_name', 'newsite_name', 'plugin_slug', 'theme_slug'))
+
+        domains = self._read_domains_file(pargs.domains_file)
+        if domains is None:
+            return False
+        if not domains:
+            Log.info(self, "No domains to create")
+            return True
+        # Dedupe on the normalized name: `www.example.com` and `example.com`
+        # are the same tenant, and provisioning it twice would let the
+        # second attempt's cleanup destroy the first.
+        domains = list(dict.fromkeys(
+            WODomain.validate(self, domain.lower()) for domain in domains))
+        invalid = [d for d in domains if not MTFunctions.valid_tenant_domain(d)]
+        if invalid:
+            Log.error(self, f"Invalid domain name(s): {', '.join(invalid)}", exit=False)
+            return False
+        existing = [d for d in domains if check_domain_exists(self, d)]
+        if existing:
+            Log.error(self, f"Site(s) already exist: {', '.join(existing)}", exit=False)
+            return False
+
+        if not MTDatabase.is_initialized(self):
+            Log.error(self, "Multi-tenancy not initialized. Run: wo multitenancy init", exit=False)
+            return False
+        config = MTFunctions.load_config(self)
+        shared_root = config.get('shared_root', '/var/www/shared')
+        if not MTFunctions.preflight_shared_config(self, shared_root):
+            Log.error(self, "Aborted: wp-config-shared.php failed preflight", exit=False)
             return False
 
+        php_version, cache_type = self._prepare_create_stack()
+        created = []
+        failed = []
+        reload_ok = True
+        try:
+            for domain in domains:
+                if self._provision_site(domain, config, shared_root, php_version,
+                                        cache_type, batch=True):
+                    created.append(domain)
+                else:
+                    failed.append(domain)
+        finally:
+            # Runs even if the batch is interrupted, so tenants already
+            # linked still go live, get committed and get their WP-Cron.
+            if created:
+                # Every new vhost already passed nginx -t; go live in one reload.
+                reload_ok = MTFunctions.safe_nginx_reload(self, created[-1])
+                if not reload_ok:
+                    Log.error(self, "Nginx reload failed; created sites are enabled "
+                                    "but not live yet: " + ', '.join(created), exit=False)
+                WOGit.add(self, ["/etc/nginx"],
+                          msg=f"Created {len(created)} shared WordPress sites")
+                self._sync_wp_cron_or_fail()
+
+        Log.info(self, f"Created {len(created)} of {len(domains)} site(s)")
+        if failed:
+            Log.warn(self, f"{len(failed)} site(s) failed: {', '.join(failed)}")
+        return reload_ok and not failed
+
     def _recover_pending_db_upgrades(self, config, shared_root,
                                      shared_sites):
         """Finish tenant DB migrations an interrupted update left pending."""
@@ -737,6 +909,7 @@ class WOMultitenancyController(CementBaseController):
         shared_root = config.get('shared_root', '/var/www/shared')
         if not MTFunctions.preflight_shared_config(self, shared_root):
             Log.error(self, "Aborted: wp-config-shared.php failed preflight")
+        update_workers = MTFunctions.worker_count(config, 'update_workers')
         
         Log.info(self, "Updating WordPress multi-tenancy infrastructure...")
 
@@ -1014,6 +1187,7 @@ class WOMultitenancyController(CementBaseController):
                         self,
                         shared_sites,
                         shared_root,
+                        workers=update_workers,
                     )
                 )
                 Log.info(self, f"Tenant DB backup directory: {db_backup_dir}")
@@ -1065,52 +1239,62 @@ class WOMultitenancyController(CementBaseController):
                 sites_by_domain = {
                     site['domain']: site for site in shared_sites
                 }
-                for site in shared_sites:
-                    domain = site['domain']
-                    if domain in preexisting_gated_domains:
-                        failures = MTFunctions.run_core_db_upgrades(
-                            self, [site]
-                        )
-                        if failures:
-                            db_upgrade_failures.extend(failures)
-                        else:
+                # Tenant upgrades are independent wp-cli runs. The ledger,
+                # gate, and cron-lock bookkeeping stays in this thread but
+                # runs as each result arrives, so a finished tenant's ledger
+                # entry and cron lock are not held until the slowest is done.
+                upgrade_workers = max(1, min(update_workers, len(shared_sites)))
+                with ThreadPoolExecutor(max_workers=upgrade_workers) as upgrade_pool:
+                    upgrade_futures = {
+                        upgrade_pool.submit(
+                            MTFunctions.run_core_db_upgrades, self, [site]
+                        ): site
+                        for site in shared_sites
+                    }
+                    for future in as_completed(upgrade_futures):
+                        site = upgrade_futures[future]
+                        failures = future.result()
+                        domain = site['domain']
+                        if domain in preexisting_gated_domains:
+                            if failures:
+                                db_upgrade_failures.extend(failures)
+                            else:
+                                _remove_pending_upgrade_domain(
+                                    self, shared_root, domain)
+                            MTFunctions.release_tenant_cron_locks({
+                                domain: cron_locks.pop(domain)
+                            })
+                            continue
+                        if not failures:
                             _remove_pending_upgrade_domain(
                                 self, shared_root, domain)
-                        MTFunctions.release_tenant_cron_locks({
-                            domain: cron_locks.pop(domain)
+                        if failures:
+                            db_upgrade_failures.extend(failures)
+                            MTFunctions.release_tenant_cron_locks({
+                                domain: cron_locks.pop(domain)
+                            })
+                            continue
+
+                        if _maintenance_disable(self, domain):
+                            pending_ungate_domains.append(domain)
+                            MTFunctions.release_tenant_cron_locks({
+                                domain: cron_locks.pop(domain)
+                            })
+                            continue
+
+                        # Keep the gate durable when its removal fails.
+                        _maintenance_enable(
+                            self, domain, maintenance_message, config
+                        )
+                        db_upgrade_failures.append({
+                            'domain': domain,
+                            'path': MTFunctions._site_htdocs(site),
+                            'error': 'database upgraded but maintenance ungate failed',
+                            'gate_failure': True,
                         })
-                        continue
-                    failures = MTFunctions.run_core_db_upgrades(self, [site])
-                    if not failures:
-                        _remove_pending_upgrade_domain(
-                            self, shared_root, domain)
-                    if failures:
-                        db_upgrade_failures.extend(failures)
                         MTFunctions.release_tenant_cron_locks({
                             domain: cron_locks.pop(domain)
                         })
-                        continue
-
-                    if _maintenance_disable(self, domain):
-                        pending_ungate_domains.append(domain)
-                        MTFunctions.release_tenant_cron_locks({
-                            domain: cron_locks.pop(domain)
-                        })
-                        continue
-
-                    # Keep the gate durable when its removal fails.
-                    _maintenance_enable(
-                        self, domain, maintenance_message, config
-                    )
-                    db_upgrade_failures.append({
-                        'domain': domain,
-                        'path': MTFunctions._site_htdocs(site),
-                        'error': 'database upgraded but maintenance ungate failed',
-                        'gate_failure': True,
-                    })
-                    MTFunctions.release_tenant_cron_locks({
-                        domain: cron_locks.pop(domain)
-                    })
 
                 # Apply every successful site's ungate in one nginx reload.
                 reload_target = shared_sites[-1]['domain']
@@ -1382,11 +1566,10 @@ class WOMultitenancyController(CementBaseController):
             Log.info(self, f"Current release: {current_release}")
             Log.info(self, f"Rolling back to: {previous_release}")
             
-            if not pargs.force:
-                confirm = input("This will affect all shared sites. Continue? (y/N): ")
-                if confirm.lower() != 'y':
-                    Log.info(self, "Rollback cancelled")
-                    return
+            if not self._confirm("This will affect all shared sites. Continue? (y/N): ",
+                                 pargs.force or pargs.yes):
+                Log.info(self, "Rollback cancelled")
+                return
             
             # Perform rollback
             Log.info(self, "Performing rollback...")
@@ -1423,34 +1606,34 @@ class WOMultitenancyController(CementBaseController):
         """Mirror the baseline.json version into the tracking DB."""
         if not MTDatabase.save_config(self, {'baseline_version': version}):
             Log.warn(self, "Could not sync baseline version to tracking DB")
+        MTFunctions.invalidate_context(self)
 
     @expose(help="Show status of multi-tenancy infrastructure")
     def status(self):
         """Display multi-tenancy status and health check"""
 
-        if not MTDatabase.is_initialized(self):
+        ctx = MTFunctions.get_context(self)
+        if not ctx.initialized:
             Log.info(self, "❌ Multi-tenancy not initialized")
             Log.info(self, "   Run: wo multitenancy init")
             return
 
-        config = MTFunctions.load_config(self)
-        shared_root = config.get('shared_root', '/var/www/shared')
+        shared_root = ctx.shared_root
 
         # Get current state
-        current_release = MTDatabase.get_current_release(self)
-        shared_sites = MTDatabase.get_shared_sites(self)
+        current_release = ctx.current_release
+        shared_sites = ctx.shared_sites
         # baseline.json is the source of truth for the baseline version;
         # the DB key is a mirror kept for the file-missing case.
         baseline = None
         try:
-            with open(f"{shared_root}/config/baseline.json") as fh:
-                baseline = json.load(fh)
+            baseline = MTFunctions.load_baseline_cached(shared_root)
         except (OSError, ValueError):
             baseline = None
         if isinstance(baseline, dict) and 'version' in baseline:
             baseline_version = baseline['version']
         else:
-            baseline_version = MTDatabase.get_baseline_version(self)
+            baseline_version = ctx.baseline_version
 
         Log.info(self, "")
         Log.info(self, "=== WordPress Multi-tenancy Status ===")
@@ -1512,10 +1695,11 @@ class WOMultitenancyController(CementBaseController):
     def list(self):
         """List all shared WordPress sites"""
 
-        if not MTDatabase.is_initialized(self):
+        ctx = MTFunctions.get_context(self)
+        if not ctx.initialized:
             Log.error(self, "Multi-tenancy not initialized")
 
-        shared_sites = MTDatabase.get_shared_sites(self)
+        shared_sites = ctx.shared_sites
 
         if not shared_sites:
             Log.info(self, "No shared WordPress sites found")
@@ -1544,20 +1728,16 @@ class WOMultitenancyController(CementBaseController):
     def baseline(self):
         """Show current baseline plugins and theme"""
 
-        if not MTDatabase.is_initialized(self):
+        ctx = MTFunctions.get_context(self)
+        if not ctx.initialized:
             Log.error(self, "Multi-tenancy not initialized")
 
-        config = MTFunctions.load_config(self)
-        shared_root = config.get('shared_root', '/var/www/shared')
-        baseline_file = f"{shared_root}/config/baseline.json"
-
-        if not os.path.exists(baseline_file):
+        try:
+            baseline = MTFunctions.load_baseline_cached(ctx.shared_root)
+        except FileNotFoundError:
             Log.error(self, "Baseline configuration not found")
             return
 
-        with open(baseline_file, 'r') as f:
-            baseline = json.load(f)
-
         Log.info(self, "Current Baseline Configuration:")
         Log.info(self, f"  Version: {baseline.get('version', 1)}")
         Log.info(self, f"  Plugins: {', '.join(baseline.get('plugins', []))}")
@@ -1580,7 +1760,6 @@ class WOMultitenancyController(CementBaseController):
         
         config = MTFunctions.load_config(self)
         shared_root = config.get('shared_root', '/var/www/shared')
-        baseline_file = f"{shared_root}/config/baseline.json"
         
         Log.info(self, "Validating Baseline Configuration...")
         Log.info(self, "=" * 60)
@@ -1598,14 +1777,13 @@ class WOMultitenancyController(CementBaseController):
             release = (marker or {}).get('release') \
                 if isinstance(marker, dict) else '?'
             Log.warn(self, "⚠️  Pending tenant DB migrations from release "
-                           f"{release}: {pending}")
-            Log.warn(self, "   Run: wo multitenancy update (recovers first)")
+                           f"{release}: {pending}\n"
+                           "   Run: wo multitenancy update (recovers first)")
             Log.info(self, "")
         
         # 1. Check baseline.json exists and is valid JSON
         try:
-            with open(baseline_file, 'r') as f:
-                baseline = json.load(f)
+            baseline = MTFunctions.load_baseline_cached(shared_root)
             Log.info(self, "✅ Baseline JSON valid")
         except FileNotFoundError:
             Log.error(self, "❌ Baseline file not found")
@@ -1620,22 +1798,29 @@ class WOMultitenancyController(CementBaseController):
         
         # 2. Check plugins exist on disk
         plugins = baseline.get('plugins', [])
-        Log.info(self, "Plugin Validation:")
+        # The section is built in memory and logged with one call; it goes
+        # out as a warning when any plugin is missing.
+        section = ["Plugin Validation:"]
         
         missing_plugins = []
+        # One directory read instead of a stat per baseline plugin.
+        installed_plugins = MTFunctions.list_subdirs(
+            f"{shared_root}/wp-content/plugins")
         for plugin_slug in plugins:
-            plugin_dir = f"{shared_root}/wp-content/plugins/{plugin_slug}"
-            
-            if os.path.exists(plugin_dir):
-                Log.info(self, f"   ✅ {plugin_slug}")
+            if plugin_slug in installed_plugins:
+                section.append(f"   ✅ {plugin_slug}")
             else:
-                Log.warn(self, f"   ❌ {plugin_slug} - NOT FOUND ON DISK")
+                section.append(f"   ❌ {plugin_slug} - NOT FOUND ON DISK")
                 missing_plugins.append(plugin_slug)
         
         if not plugins:
-            Log.info(self, "   No baseline plugins configured")
+            section.append("   No baseline plugins configured")
         
-        Log.info(self, "")
+        section.append("")
+        if missing_plugins:
+            Log.warn(self, "\n".join(section))
+        else:
+            Log.info(self, "\n".join(section))
         
         # 3. Check theme exists
         theme_slug = baseline.get('theme')
@@ -1651,40 +1836,39 @@ class WOMultitenancyController(CementBaseController):
             Log.info(self, "")
         
         # 4. Check site baseline versions
-        from wo.core.database import db_session
-        from wo.cli.plugins.multitenancy_db import MultitenancySite
-        
-        session = db_session
-        sites = session.query(MultitenancySite).filter_by(is_enabled=True).all()
-        production_sites = sites
-        
-        outdated_sites = []
-        for site in production_sites:
-            site_version = getattr(site, 'baseline_version', 0)
-            if site_version < baseline_version:
-                outdated_sites.append((site.domain, site_version))
-        
-        if outdated_sites:
-            Log.warn(self, f"⚠️  {len(outdated_sites)} site(s) behind baseline:")
-            for domain, version in outdated_sites[:10]:  # Show first 10
-                Log.warn(self, f"   - {domain} (version {version}, should be {baseline_version})")
-            
-            if len(outdated_sites) > 10:
-                Log.warn(self, f"   ... and {len(outdated_sites) - 10} more")
-            
+        # One query returns the fleet totals and the first outdated rows.
+        snapshot = MTDatabase.get_validation_snapshot(self, baseline_version)
+        total_sites = snapshot['total']
+        outdated_count = snapshot['outdated_count']
+        outdated_sites = snapshot['outdated']
+        has_sites = total_sites > 0
+        
+        if not has_sites:
+            Log.info(self, "No production sites tracked")
             Log.info(self, "")
-            Log.info(self, "   Run: wo multitenancy apply")
+        elif outdated_sites:
+            # Build the report once: one write instead of a call per site.
+            report = [f"⚠️  {outdated_count} site(s) behind baseline:"]
+            report.extend(
+                f"   - {domain} (version {version}, should be {baseline_version})"
+                for domain, version in outdated_sites  # First 10
+            )
+            if outdated_count > 10:
+                report.append(f"   ... and {outdated_count - 10} more")
+            report.extend(["", "   Run: wo multitenancy apply"])
+            Log.warn(self, "\n".join(report))
         else:
-            Log.info(self, f"✅ All {len(production_sites)} production sites up to date")
+            Log.info(self, f"✅ All {total_sites} production sites up to date")
             Log.info(self, "")
         
         # 6. Summary
         Log.info(self, "=" * 60)
         
         if missing_plugins:
-            Log.error(self, f"❌ VALIDATION FAILED: {len(missing_plugins)} plugin(s) missing from disk")
-            Log.error(self, "   This will cause activation failures!")
-            Log.error(self, "   Fix: Install missing plugins or remove from baseline")
+            # Log.error exits, so the hint lines must share its single write.
+            Log.error(self, f"❌ VALIDATION FAILED: {len(missing_plugins)} plugin(s) missing from disk\n"
+                            "   This will cause activation failures!\n"
+                            "   Fix: Install missing plugins or remove from baseline")
         elif outdated_sites:
             Log.warn(self, "⚠️  ATTENTION NEEDED: Some sites require updates")
         else:
@@ -1725,63 +1909,41 @@ class WOMultitenancyController(CementBaseController):
             return
         
         # Check if site exists in tracking
+        from sqlalchemy import select
         from wo.core.database import db_session
         from wo.cli.plugins.multitenancy_db import MultitenancySite
         
         session = db_session
-        site = session.query(MultitenancySite).filter_by(domain=domain).first()
+        # Only the columns the post-delete cache cleanup needs; no ORM row.
+        site = session.execute(
+            select(MultitenancySite.redis_prefix, MultitenancySite.redis_db,
+                   MultitenancySite.php_version)
+            .where(MultitenancySite.domain == domain)
+        ).first()
         
         if not site:
             Log.error(self, f"Site {domain} not found in multitenancy tracking")
-            Log.info(self, "Use: wo site delete {domain} for regular sites")
+            Log.info(self, f"Use: wo site delete {domain} for regular sites")
             return
         
         # Confirm deletion
-        if not pargs.force:
+        if not (pargs.force or pargs.yes):
             Log.warn(self, f"This will delete site: {domain}")
-            confirm = input("Continue? [y/N]: ").strip().lower()
-            if confirm != 'y':
+            if not self._confirm("Continue? [y/N]: ", False):
                 Log.info(self, "Aborted")
                 return
         
         Log.info(self, f"Deleting site: {domain}")
 
-        # Preserve the acme.sh certificate store across deletion so a
-        # future recreate reuses the certificate instead of burning a
-        # Let's Encrypt issuance (tenant domains get recreated often).
-        # Hiding the renewal dir makes WOAcme.cert_check() report no
-        # cert, so `wo site delete` skips its certificate purge.
-        cert_store = f'/etc/letsencrypt/renewal/{domain}_ecc'
-        cert_stash = f'{cert_store}.preserved'
-        preserve_cert = os.path.isdir(cert_store)
-        if preserve_cert:
-            Log.debug(self, f"Preserving SSL certificate store for {domain}")
-            os.rename(cert_store, cert_stash)
-
-        # Delete the site using regular WO command
-        try:
-            import subprocess
-            result = subprocess.run(
-                ['wo', 'site', 'delete', domain, '--no-prompt'],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-
-            if result.returncode != 0:
-                Log.error(self, f"Failed to delete site: {result.stderr}")
-                Log.info(self, f"site_delete_failed target={domain} result=failure")
-                return
-
-            Log.info(self, "✅ Site files and database deleted")
-
-        except Exception as e:
-            Log.error(self, f"Error deleting site: {e}")
+        if os.environ.get('WO_MT_SUBPROC_DELETE'):
+            error = self._delete_one_subprocess(domain)
+        else:
+            error = self._delete_one_site(domain)
+        if error is not None:
+            Log.error(self, error)
             Log.info(self, f"site_delete_failed target={domain} result=failure")
             return
-        finally:
-            if preserve_cert and os.path.isdir(cert_stash):
-                os.rename(cert_stash, cert_store)
+        Log.info(self, "✅ Site files and database deleted")
 
         # `wo site delete` leaves the FastCGI page cache and Redis object-cache
         # keys behind (both key on the domain); purge them so a future recreate
@@ -1800,8 +1962,7 @@ class WOMultitenancyController(CementBaseController):
 
         # Remove from multitenancy tracking
         try:
-            session.delete(site)
-            session.commit()
+            MTDatabase.delete_sites(self, [domain])
             if not write_tombstone(domain):
                 Log.warn(
                     self,
@@ -1820,6 +1981,304 @@ class WOMultitenancyController(CementBaseController):
             Log.warn(self, f"Manually clean up with: sqlite3 /var/lib/wo/dbase.db \"DELETE FROM multitenancy_sites WHERE domain = '{domain}';\"")
 
 
+    @contextlib.contextmanager
+    def _preserved_cert_store(self, domain):
+        """Hide the tenant's acme.sh renewal dir for the duration of a delete.
+
+        Tenant domains get recreated often; keeping the certificate store
+        lets a recreate reuse the certificate instead of burning a Let's
+        Encrypt issuance. With the renewal dir hidden, WOAcme.cert_check()
+        reports no cert, so site deletion skips its certificate purge.
+        """
+        cert_store = f'/etc/letsencrypt/renewal/{domain}_ecc'
+        cert_stash = f'{cert_store}.preserved'
+        preserve_cert = os.path.isdir(cert_store)
+        if preserve_cert:
+            Log.debug(self, f"Preserving SSL certificate store for {domain}")
+            os.rename(cert_store, cert_stash)
+        try:
+            yield
+        finally:
+            if preserve_cert and os.path.isdir(cert_stash):
+                os.rename(cert_stash, cert_store)
+
+    def _delete_one_site(self, domain):
+        """Do what `wo site delete <domain> --no-prompt` does, in-process.
+
+        Drops the tenant database, webroot, nginx vhost and `wo site`
+        record through the same site_functions helpers, sharing this
+        process's DB session and config. Returns None or the error.
+        """
+        with self._preserved_cert_store(domain):
+            try:
+                site = getSiteInfo(self, domain)
+                if site is None:
+                    return f"Failed to delete site: site {domain} does not exist"
+                if site.site_type in ('mysql', 'wp', 'wpsubdir', 'wpsubdomain') \
+                        and site.db_name not in ('deleted', ''):
+                    if self.app.config.has_section('mysql'):
+                        grant_host = self.app.config.get('mysql', 'grant-host')
+                    else:
+                        grant_host = 'localhost'
+                    Log.debug(self, f"Deleting database {site.db_name}")
+                    deleteDB(self, site.db_name, site.db_user, grant_host, False)
+                    updateSiteInfo(self, domain, db_name='deleted',
+                                   db_user='deleted', db_password='deleted')
+                if site.site_path != 'deleted':
+                    deleteWebRoot(self, site.site_path)
+                    updateSiteInfo(self, domain, webroot='deleted')
+                removeNginxConf(self, domain)
+                deleteSiteInfo(self, domain)
+                WOAcme.removeconf(self, domain)
+                return None
+            except Exception as e:
+                return f"Error deleting site: {e}"
+
+    def _delete_one_subprocess(self, domain):
+        """Run `wo site delete` for one tenant; return None or the error.
+
+        Never touches db_session, so `delete-many` can run it from worker
+        threads.
+        """
+        with self._preserved_cert_store(domain):
+            try:
+                # Log.error writes to stdout, so fold stderr into the same
+                # pipe: one capture buffer that still carries the reason.
+                result = subprocess.run(
+                    [_wo_bin(), 'site', 'delete', domain, '--no-prompt'],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    timeout=300
+                )
+                if result.returncode != 0:
+                    return f"Failed to delete site: {result.stdout}"
+                return None
+            except Exception as e:
+                return f"Error deleting site: {e}"
+
+    def _delete_site_data(self, site, grant_host):
+        """Drop one tenant's database and webroot; return None or the error.
+
+        site is the (site_type, db_name, db_user, site_path) tuple read
+        beforehand. Never touches db_session or /etc/nginx, so `delete-many`
+        can run it from worker threads.
+        """
+        site_type, db_name, db_user, site_path = site
+        try:
+            if site_type in ('mysql', 'wp', 'wpsubdir', 'wpsubdomain') \
+                    and db_name not in ('deleted', ''):
+                Log.debug(self, f"Deleting database {db_name}")
+                deleteDB(self, db_name, db_user, grant_host, False)
+            # Not deleteWebRoot: WOFileUtils.rm exits through Log.error on
+            # an OSError, which must never run off the main thread.
+            webroot = (site_path or '').strip()
+            if site_path != 'deleted' and webroot not in (
+                    '/var/www/', '/var/www', '/var/www/..', '/var/www/.'):
+                if os.path.isdir(webroot):
+                    Log.debug(self, f"Removing {webroot}")
+                    shutil.rmtree(webroot)
+            return None
+        except Exception as e:
+            return f"Error deleting site: {e}"
+
+    def _remove_site_config(self, domain):
+        """Unlink a deleted tenant's vhost and drop its `wo site` record.
+
+        Leaves the nginx reload and the /etc/nginx commit to the caller so
+        a batch does each once. Returns None or the error.
+        """
+        with self._preserved_cert_store(domain):
+            try:
+                for path in (f'/etc/nginx/sites-enabled/{domain}',
+                             f'/etc/nginx/sites-available/{domain}'):
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(path)
+                deleteSiteInfo(self, domain)
+                WOAcme.removeconf(self, domain)
+                return None
+            except Exception as e:
+                return f"Error removing site config: {e}"
+
+    @expose(help="Delete many multitenancy sites listed in --domains-file")
+    @fleet_operation('delete_many')
+    def delete_many(self):
+        """Tear down a batch of tenants, overlapping their DB and webroot removal"""
+        result = self._delete_many_impl()
+        if not result:
+            self.app.close(1)
+        return result
+
+    def _read_domains_file(self, path):
+        """Return the unique domains listed in path (stdin for '-')."""
+        try:
+            if path == '-':
+                lines = sys.stdin.read().splitlines()
+            else:
+                with open(path) as fh:
+                    lines = fh.read().splitlines()
+        except OSError as e:
+            Log.error(self, f"Cannot read domains file {path}: {e}", exit=False)
+            return None
+        domains = []
+        for line in lines:
+            line = line.split('#', 1)[0].strip()
+            if line and line not in domains:
+                domains.append(line)
+        return domains
+
+    def _delete_many_impl(self):
+        pargs = self.app.pargs
+
+        if not pargs.domains_file:
+            Log.error(self, "Usage: wo multitenancy delete-many --domains-file <file|-> [--parallel N]", exit=False)
+            return False
+        _reject_extra_positionals(self, pargs, fields=('site_name', 'newsite_name', 'plugin_slug', 'theme_slug'))
+        if pargs.parallel is None or pargs.parallel < 1:
+            Log.error(self, "--parallel must be a positive integer", exit=False)
+            return False
+
+        domains = self._read_domains_file(pargs.domains_file)
+        if domains is None:
+            return False
+        if not domains:
+            Log.info(self, "No domains to delete")
+            return True
+        invalid = [d for d in domains if not MTFunctions.valid_tenant_domain(d)]
+        if invalid:
+            Log.error(self, f"Invalid domain name(s): {', '.join(invalid)}", exit=False)
+            return False
+
+        if not MTDatabase.is_initialized(self):
+            Log.error(self, "Multi-tenancy not initialized", exit=False)
+            return False
+
+        from wo.core.database import db_session
+        from wo.cli.plugins.multitenancy_db import MultitenancySite
+
+        session = db_session
+        # One IN (...) query per chunk instead of a SELECT per domain; only
+        # the columns the post-delete cleanup needs are loaded.
+        sites = {}
+        for batch in _chunked(domains, SQL_IN_CHUNK):
+            for row in session.query(
+                MultitenancySite.domain, MultitenancySite.redis_prefix,
+                MultitenancySite.redis_db, MultitenancySite.php_version,
+            ).filter(MultitenancySite.domain.in_(batch)):
+                sites[row.domain] = row
+        untracked = [d for d in domains if d not in sites]
+        if untracked:
+            Log.error(self, "Not found in multitenancy tracking: "
+                            f"{', '.join(untracked)}", exit=False)
+            return False
+
+        if not (pargs.force or pargs.yes):
+            Log.warn(self, f"This will delete {len(domains)} site(s): {', '.join(domains)}")
+            if not self._confirm("Continue? [y/N]: ", False):
+                Log.info(self, "Aborted")
+                return True
+
+        # Read everything the teardown needs here; workers never touch
+        # db_session.
+        if self.app.config.has_section('mysql'):
+            grant_host = self.app.config.get('mysql', 'grant-host')
+        else:
+            grant_host = 'localhost'
+        failed = []
+        plans = {}
+        for domain in domains:
+            site = getSiteInfo(self, domain)
+            if site is None:
+                failed.append(domain)
+                Log.error(self, f"{domain}: site does not exist", exit=False)
+                Log.info(self, f"site_delete_failed target={domain} result=failure")
+                continue
+            plans[domain] = (site.site_type, site.db_name, site.db_user,
+                             site.site_path)
+
+        # DB drops and webroot unlinks block on I/O, so overlap them. Vhost
+        # removal, the nginx reload and the /etc/nginx commit share one git
+        # index, so they run afterwards in this thread, once for the batch.
+        workers = min(pargs.parallel, len(domains))
+        Log.info(self, f"Deleting {len(domains)} site(s) with {workers} worker(s)")
+        data_deleted = set()
+        if plans:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(self._delete_site_data, plan, grant_host): domain
+                    for domain, plan in plans.items()
+                }
+                for future in as_completed(futures):
+                    domain = futures[future]
+                    error = future.result()
+                    if error is not None:
+                        failed.append(domain)
+                        Log.error(self, f"{domain}: {error}", exit=False)
+                        Log.info(self, f"site_delete_failed target={domain} result=failure")
+                        continue
+                    data_deleted.add(domain)
+
+        deleted = []
+        for domain in domains:
+            if domain not in data_deleted:
+                continue
+            error = self._remove_site_config(domain)
+            if error is not None:
+                failed.append(domain)
+                Log.error(self, f"{domain}: {error}", exit=False)
+                Log.info(self, f"site_delete_failed target={domain} result=failure")
+                continue
+            deleted.append(domain)
+            Log.info(self, f"✅ {domain}: site files and database deleted")
+
+        if deleted and not MTFunctions.safe_nginx_reload(self, deleted[-1]):
+            Log.warn(self, "Nginx reload failed after removing vhosts")
+
+        php_keys = set()
+        for domain in deleted:
+            site = sites[domain]
+            MTFunctions.purge_site_cache(
+                self, domain, getattr(site, 'redis_prefix', None),
+                getattr(site, 'redis_db', None))
+            php_version = str(getattr(site, 'php_version', '') or '')
+            php_keys.add(('php' + php_version.replace('.', ''))
+                         if php_version else None)
+        for php_key in php_keys:
+            if not MTFunctions.reset_opcache(self, php_key=php_key):
+                Log.warn(self, "Opcache reset failed after site deletion")
+
+        tracking_ok = True
+        if deleted:
+            try:
+                MTDatabase.delete_sites(self, deleted)
+            except Exception as e:
+                tracking_ok = False
+                Log.error(self, f"Error removing from tracking: {e}", exit=False)
+                Log.warn(self, "Sites deleted but tracking entries remain: "
+                               f"{', '.join(deleted)}")
+            if tracking_ok:
+                for domain in deleted:
+                    if not write_tombstone(domain):
+                        Log.warn(
+                            self,
+                            f"Could not write backup tombstone for {domain}; "
+                            "deleted-tenant snapshots will not be swept automatically"
+                        )
+                    Log.info(self, f"site_deleted target={domain} result=success")
+                Log.info(self, f"✅ Removed {len(deleted)} site(s) from multitenancy tracking")
+                self._sync_wp_cron_or_fail()
+            # Last, because WOGit.add exits through Log.error if the commit
+            # fails: by then every tenant is fully torn down.
+            WOGit.add(self, ["/etc/nginx"],
+                      msg=f"Deleted {len(deleted)} shared WordPress sites")
+
+        if not tracking_ok:
+            return False
+        if failed:
+            Log.warn(self, f"{len(failed)} site(s) failed to delete: {', '.join(failed)}")
+            return False
+        return True
+
     def _rename_impl(self):
         pargs = self.app.pargs
 
@@ -1895,10 +2354,9 @@ class WOMultitenancyController(CementBaseController):
         timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
         backup_dir = f'/var/www/.wo-rename-{old_domain}-to-{new_domain}-{timestamp}'
 
-        if not pargs.force:
+        if not (pargs.force or pargs.yes):
             Log.warn(self, f"This will rename site: {old_domain} -> {new_domain}")
-            confirm = input("Continue? [y/N]: ").strip().lower()
-            if confirm != 'y':
+            if not self._confirm("Continue? [y/N]: ", False):
                 Log.info(self, "Aborted")
                 return False
 
@@ -2191,53 +2649,26 @@ class WOMultitenancyController(CementBaseController):
         if not MTDatabase.is_initialized(self):
             Log.error(self, "Multi-tenancy not initialized. Run: wo multitenancy init")
         
-        # Validate: only one source method allowed
-        source_count = sum([bool(github_repo), bool(url)])
-        if source_count > 1:
-            Log.error(self, "Specify only one source: --github OR --url (default is WordPress.org)")
-        
-        if branch and tag:
-            Log.error(self, "Specify only one GitHub ref: --branch OR --tag")
-        
-        # Validate: branch/tag only valid with GitHub
-        if (branch or tag) and not github_repo:
-            Log.error(self, "--branch and --tag can only be used with --github")
+        try:
+            source_info, download, source = _baseline_source(
+                'plugin', plugin_slug, github_repo, url, branch, tag)
+        except ValueError as e:
+            Log.error(self, str(e))
         
         config = MTFunctions.load_config(self)
         shared_root = config.get('shared_root', '/var/www/shared')
         
-        # Determine and display source
-        if github_repo:
-            source_info = f"from GitHub: {github_repo}"
-            if tag:
-                source_info += f" (tag: {tag})"
-            elif branch:
-                source_info += f" (branch: {branch})"
-        elif url:
-            source_info = f"from URL: {url}"
-        else:
-            source_info = "from WordPress.org"
+        # Reject duplicates before spending a download on them
+        baseline_file = f"{shared_root}/config/baseline.json"
+        baseline = MTFunctions.load_baseline_cached(shared_root)
+        if plugin_slug in baseline.get('plugins', []):
+            Log.error(self, f"Plugin {plugin_slug} already in baseline")
         
         Log.info(self, f"Adding plugin: {plugin_slug} {source_info}")
         
         # Download plugin using appropriate method
         infra = SharedInfrastructure(self, shared_root)
-        
-        if github_repo:
-            # Download from GitHub
-            success = infra.download_plugin_from_github(
-                github_repo, 
-                plugin_slug, 
-                branch=branch, 
-                tag=tag
-            )
-        elif url:
-            # Download from direct URL
-            success = infra.download_plugin_from_url(url, plugin_slug)
-        else:
-            # Download from WordPress.org (default)
-            infra.download_plugin(plugin_slug)
-            success = True  # download_plugin doesn't return bool, check directory instead
+        download(infra)
         
         # Verify plugin was downloaded
         plugin_dir = f"{shared_root}/wp-content/plugins/{plugin_slug}"
@@ -2254,59 +2685,18 @@ class WOMultitenancyController(CementBaseController):
         Log.info(self, f"✅ Downloaded {plugin_slug}")
         
         # Update baseline.json
-        baseline_file = f"{shared_root}/config/baseline.json"
-        with open(baseline_file, 'r') as f:
-            baseline = json.load(f)
-        
-        # Check if already in baseline
-        if plugin_slug in baseline.get('plugins', []):
-            Log.error(self, f"Plugin {plugin_slug} already in baseline")
-        
         # Increment version and add plugin
         old_version = baseline.get('version', 1)
         new_version = old_version + 1
         
         baseline['version'] = new_version
-        baseline['generated'] = datetime.now().isoformat()
+        baseline['generated'] = MTFunctions.baseline_timestamp()
         baseline['plugins'].append(plugin_slug)
         
-        plugin_sources = baseline.setdefault('sources', {}).setdefault('plugins', {})
-        if github_repo:
-            if branch:
-                plugin_sources[plugin_slug] = {
-                    'type': 'github',
-                    'repo': github_repo,
-                    'ref_type': 'branch',
-                    'ref': branch,
-                }
-            elif tag:
-                plugin_sources[plugin_slug] = {
-                    'type': 'github',
-                    'repo': github_repo,
-                    'ref_type': 'tag',
-                    'ref': tag,
-                }
-            else:
-                plugin_sources[plugin_slug] = {
-                    'type': 'github',
-                    'repo': github_repo,
-                    'ref_type': 'default',
-                    'ref': None,
-                }
-        elif url:
-            plugin_sources[plugin_slug] = {
-                'type': 'url',
-                'url': url,
-            }
-        else:
-            plugin_sources[plugin_slug] = {
-                'type': 'wordpress',
-                'version': 'latest',
-            }
+        baseline.setdefault('sources', {}).setdefault('plugins', {})[plugin_slug] = source
         
         # Write updated baseline
-        with open(baseline_file, 'w') as f:
-            json.dump(baseline, f, indent=2)
+        MTFunctions.write_baseline(baseline_file, baseline)
         
         Log.info(self, f"✅ Updated baseline.json (v{old_version} → v{new_version})")
         
@@ -2365,53 +2755,31 @@ class WOMultitenancyController(CementBaseController):
         if not MTDatabase.is_initialized(self):
             Log.error(self, "Multi-tenancy not initialized")
         
-        # Validate: only one source method allowed
-        source_count = sum([bool(github_repo), bool(url)])
-        if source_count > 1:
-            Log.error(self, "Specify only one source: --github OR --url (default is WordPress.org)")
-        
-        if branch and tag:
-            Log.error(self, "Specify only one GitHub ref: --branch OR --tag")
-        
-        # Validate: branch/tag only valid with GitHub
-        if (branch or tag) and not github_repo:
-            Log.error(self, "--branch and --tag can only be used with --github")
+        try:
+            source_info, download, source = _baseline_source(
+                'theme', theme_slug, github_repo, url, branch, tag)
+        except ValueError as e:
+            Log.error(self, str(e))
         
         config = MTFunctions.load_config(self)
         shared_root = config.get('shared_root', '/var/www/shared')
         
-        # Determine and display source
-        if github_repo:
-            source_info = f"from GitHub: {github_repo}"
-            if tag:
-                source_info += f" (tag: {tag})"
-            elif branch:
-                source_info += f" (branch: {branch})"
-        elif url:
-            source_info = f"from URL: {url}"
-        else:
-            source_info = "from WordPress.org"
+        # Re-adding the default theme from the source it already came from
+        # changes nothing, so skip the download; a new source refreshes it.
+        baseline_file = f"{shared_root}/config/baseline.json"
+        baseline = MTFunctions.load_baseline_cached(shared_root)
+        theme_sources = (baseline.get('sources') or {}).get('themes') or {}
+        if set_default and baseline.get('theme') == theme_slug \
+                and theme_sources.get(theme_slug) == source:
+            Log.info(self, f"Theme {theme_slug} is already the default theme "
+                           f"{source_info}; nothing to change")
+            return
         
         Log.info(self, f"Adding theme: {theme_slug} {source_info}")
         
         # Download theme using appropriate method
         infra = SharedInfrastructure(self, shared_root)
-        
-        if github_repo:
-            # Download from GitHub
-            success = infra.download_theme_from_github(
-                github_repo, 
-                theme_slug, 
-                branch=branch, 
-                tag=tag
-            )
-        elif url:
-            # Download from direct URL
-            success = infra.download_theme_from_url(url, theme_slug)
-        else:
-            # Download from WordPress.org (default)
-            infra.download_theme(theme_slug)
-            success = True  # download_theme doesn't return bool, check directory instead
+        download(infra)
         
         # Verify theme was downloaded
         theme_dir = f"{shared_root}/wp-content/themes/{theme_slug}"
@@ -2428,49 +2796,13 @@ class WOMultitenancyController(CementBaseController):
         Log.info(self, f"✅ Downloaded {theme_slug}")
         
         # Update baseline.json
-        baseline_file = f"{shared_root}/config/baseline.json"
-        with open(baseline_file, 'r') as f:
-            baseline = json.load(f)
-        
         old_version = baseline.get('version', 1)
         new_version = old_version + 1
         
         baseline['version'] = new_version
-        baseline['generated'] = datetime.now().isoformat()
+        baseline['generated'] = MTFunctions.baseline_timestamp()
         
-        theme_sources = baseline.setdefault('sources', {}).setdefault('themes', {})
-        if github_repo:
-            if branch:
-                theme_sources[theme_slug] = {
-                    'type': 'github',
-                    'repo': github_repo,
-                    'ref_type': 'branch',
-                    'ref': branch,
-                }
-            elif tag:
-                theme_sources[theme_slug] = {
-                    'type': 'github',
-                    'repo': github_repo,
-                    'ref_type': 'tag',
-                    'ref': tag,
-                }
-            else:
-                theme_sources[theme_slug] = {
-                    'type': 'github',
-                    'repo': github_repo,
-                    'ref_type': 'default',
-                    'ref': None,
-                }
-        elif url:
-            theme_sources[theme_slug] = {
-                'type': 'url',
-                'url': url,
-            }
-        else:
-            theme_sources[theme_slug] = {
-                'type': 'wordpress',
-                'version': 'latest',
-            }
+        baseline.setdefault('sources', {}).setdefault('themes', {})[theme_slug] = source
         
         if set_default:
             old_theme = baseline.get('theme', 'none')
@@ -2478,8 +2810,7 @@ class WOMultitenancyController(CementBaseController):
             Log.info(self, f"✅ Set as default theme (was: {old_theme})")
         
         # Write updated baseline
-        with open(baseline_file, 'w') as f:
-            json.dump(baseline, f, indent=2)
+        MTFunctions.write_baseline(baseline_file, baseline)
         
         Log.info(self, f"✅ Updated baseline.json (v{old_version} → v{new_version})")
         
@@ -2527,8 +2858,7 @@ class WOMultitenancyController(CementBaseController):
         
         # Update baseline.json
         baseline_file = f"{shared_root}/config/baseline.json"
-        with open(baseline_file, 'r') as f:
-            baseline = json.load(f)
+        baseline = MTFunctions.load_baseline_cached(shared_root)
         
         # Check if plugin is in baseline
         if plugin_slug not in baseline.get('plugins', []):
@@ -2538,14 +2868,13 @@ class WOMultitenancyController(CementBaseController):
         new_version = old_version + 1
         
         baseline['version'] = new_version
-        baseline['generated'] = datetime.now().isoformat()
+        baseline['generated'] = MTFunctions.baseline_timestamp()
         baseline['plugins'].remove(plugin_slug)
         plugin_sources = (baseline.get('sources') or {}).get('plugins') or {}
         plugin_sources.pop(plugin_slug, None)
         
         # Write updated baseline
-        with open(baseline_file, 'w') as f:
-            json.dump(baseline, f, indent=2)
+        MTFunctions.write_baseline(baseline_file, baseline)
         
         Log.info(self, f"✅ Updated baseline.json (v{old_version} → v{new_version})")
         
@@ -2626,10 +2955,8 @@ class WOMultitenancyController(CementBaseController):
         shared_root = config.get('shared_root', '/var/www/shared')
         
         # Get theme name from baseline
-        baseline_file = f"{shared_root}/config/baseline.json"
         try:
-            with open(baseline_file, 'r') as f:
-                baseline = json.load(f)
+            baseline = MTFunctions.load_baseline_cached(shared_root)
             theme_name = baseline.get('theme')
             if not theme_name:
                 Log.error(self, "No theme configured in baseline")
@@ -2669,10 +2996,8 @@ class WOMultitenancyController(CementBaseController):
         shared_root = config.get('shared_root', '/var/www/shared')
         if not MTFunctions.preflight_shared_config(self, shared_root):
             Log.error(self, "Aborted: wp-config-shared.php failed preflight")
-        baseline_file = f"{shared_root}/config/baseline.json"
 
-        with open(baseline_file, 'r') as f:
-            baseline = json.load(f)
+        baseline = MTFunctions.load_baseline_cached(shared_root)
 
         baseline_version = baseline.get('version', 1)
 
@@ -2758,16 +3083,32 @@ class WOMultitenancyController(CementBaseController):
         shared_root = config.get('shared_root', '/var/www/shared')
         
         Log.warn(self, "This will remove all shared WordPress infrastructure!")
-        if not pargs.force:
-            confirm = input("Type 'REMOVE' to confirm: ")
-            if confirm != 'REMOVE':
-                Log.info(self, "Removal cancelled")
-                return
+        if not self._confirm("Type 'REMOVE' to confirm: ", pargs.force or pargs.yes,
+                             token='REMOVE'):
+            Log.info(self, "Removal cancelled")
+            return
         
         try:
-            # Remove shared directory
+            # Remove shared directory: rename it aside (instant, and the path
+            # is free for a fresh init right away), then let a detached
+            # `rm -rf` reclaim the space so the command does not block on
+            # a multi-GB tree.
             if os.path.exists(shared_root):
-                shutil.rmtree(shared_root)
+                trash = f"{shared_root.rstrip('/')}.removing-{os.getpid()}"
+                try:
+                    os.rename(shared_root, trash)
+                except OSError:
+                    # Mount point or cross-device: delete in place.
+                    shutil.rmtree(shared_root)
+                else:
+                    subprocess.Popen(
+                        ['rm', '-rf', '--', trash],
+                        stdin=subprocess.DEVNULL,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        start_new_session=True,
+                    )
+                    Log.debug(self, f"Deleting {trash} in the background")
                 Log.info(self, f"Removed {shared_root}")
             
             # Clean up database
@@ -2819,17 +3160,27 @@ class WOMultitenancyController(CementBaseController):
         
         # Update baseline.json
         baseline_file = f"{shared_root}/config/baseline.json"
-        with open(baseline_file, 'r') as f:
-            baseline = json.load(f)
+        baseline = MTFunctions.load_baseline_cached(shared_root)
         
         old_theme = baseline.get('theme', 'none')
         old_version = baseline.get('version', 1)
+        
+        if old_theme == theme_slug:
+            # No state change: skip the version bump, write and git commit.
+            # --apply-now still re-syncs sites to the current baseline.
+            Log.info(self, f"Theme already {theme_slug} (baseline v{old_version}); nothing to change")
+            if apply_now:
+                Log.info(self, "")
+                Log.info(self, "Applying to all sites...")
+                BaselineApplicator.apply_baseline_to_sites(self, config, old_version)
+            return
+        
         new_version = old_version + 1
         
         # Update baseline with new theme
         baseline['version'] = new_version
         baseline['theme'] = theme_slug
-        baseline['generated'] = datetime.now().isoformat()
+        baseline['generated'] = MTFunctions.baseline_timestamp()
         infra = SharedInfrastructure(self, shared_root)
         theme_sources = baseline.setdefault('sources', {}).setdefault('themes', {})
         if theme_slug not in theme_sources:
@@ -2840,8 +3191,7 @@ class WOMultitenancyController(CementBaseController):
                 Log.warn(self, f"No download source configured for theme {theme_slug}; future update-theme will fail until a source is added")
         
         # Write updated baseline
-        with open(baseline_file, 'w') as f:
-            json.dump(baseline, f, indent=2)
+        MTFunctions.write_baseline(baseline_file, baseline)
         
         Log.info(self, f"✅ Updated baseline.json (v{old_version} → v{new_version})")
         Log.info(self, f"   Theme: {old_theme} → {theme_slug}")
@@ -2883,36 +3233,60 @@ class WOMultitenancyController(CementBaseController):
         config = MTFunctions.load_config(self)
         shared_root = config.get('shared_root', '/var/www/shared')
         
-        git_dir = f"{shared_root}/.git"
-        if not os.path.exists(git_dir):
-            Log.error(self, "Git tracking not initialized")
-            Log.error(self, "History is only available for systems initialized with git support")
-        
-        Log.info(self, "Baseline Change History:")
-        Log.info(self, "=" * 60)
+        def _header():
+            Log.info(self, "Baseline Change History:")
+            Log.info(self, "=" * 60)
         
         try:
-            # Get git log for baseline.json (last 20 commits)
-            result = subprocess.run(
-                ['git', 'log', '--oneline', '--decorate', '-20', 
-                 'config/baseline.json'],
-                cwd=shared_root,
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            # Get git log for baseline.json (last 20 commits). The explicit
+            # format matches --oneline --decorate; `--` keeps a missing file
+            # from being parsed as a revision. Lines are printed as git
+            # produces them rather than after the whole log is buffered.
+            # --git-dir pins the repository to shared_root, so a missing
+            # .git fails here instead of needing a separate stat up front.
+            argv = ['git', '--git-dir=.git', 'log', '--no-patch',
+                    '--no-renames', '--format=%h%d %s', '-20', '--',
+                    'config/baseline.json']
+            shown = 0
+            try:
+                with subprocess.Popen(
+                    argv,
+                    cwd=shared_root,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    bufsize=1
+                ) as proc:
+                    for line in proc.stdout:
+                        if not shown:
+                            _header()
+                        Log.info(self, line.rstrip())
+                        shown += 1
+                    err = proc.stderr.read()
+                returncode = proc.returncode
+            except FileNotFoundError:
+                if os.path.isdir(shared_root):
+                    raise  # git itself is missing
+                err, returncode = 'not a git repository', 128
+            if returncode:
+                if 'not a git repository' in err:
+                    Log.error(self, "Git tracking not initialized")
+                    Log.error(self, "History is only available for systems initialized with git support")
+                raise subprocess.CalledProcessError(
+                    returncode, argv, stderr=err)
             
-            if result.stdout:
-                # Display the git log output
-                Log.info(self, result.stdout.strip())
-            else:
+            if not shown:
+                _header()
                 Log.info(self, "No history yet")
             
-            Log.info(self, "=" * 60)
-            Log.info(self, "")
-            Log.info(self, "View full history: cd /var/www/shared && git log config/baseline.json")
-            Log.info(self, "View specific commit: git show <commit-hash>")
-            Log.info(self, "Compare versions: git diff <commit1> <commit2> config/baseline.json")
+            # Footer goes out in one call rather than one per line.
+            Log.info(self, "\n".join([
+                "=" * 60,
+                "",
+                "View full history: cd /var/www/shared && git log config/baseline.json",
+                "View specific commit: git show <commit-hash>",
+                "Compare versions: git diff <commit1> <commit2> config/baseline.json",
+            ]))
             
         except subprocess.CalledProcessError as e:
             Log.error(self, f"Failed to get history: {e}")
@@ -2953,15 +3327,8 @@ class WOMultitenancyController(CementBaseController):
         shared_root = config.get('shared_root', '/var/www/shared')
         baseline_file = f"{shared_root}/config/baseline.json"
         
-        # Check git exists
-        git_dir = f"{shared_root}/.git"
-        if not os.path.exists(git_dir):
-            Log.error(self, "Git tracking not initialized")
-            Log.error(self, "Cannot rollback without git history")
-        
         # Read current baseline
-        with open(baseline_file, 'r') as f:
-            current = json.load(f)
+        current = MTFunctions.load_baseline_cached(shared_root)
         
         current_version = current.get('version', 0)
         
@@ -2970,89 +3337,87 @@ class WOMultitenancyController(CementBaseController):
         Log.warn(self, "")
         
         try:
-            # If version specified, find the corresponding commit
-            if to_version:
-                # Search git log for the version
-                result = subprocess.run(
-                    ['git', 'log', '--all', '--grep', f'Baseline v{to_version}:', 
-                     '--format=%H', '-1', 'config/baseline.json'],
-                    cwd=shared_root,
-                    capture_output=True,
-                    text=True,
-                    check=True
-                )
-                
-                to_commit = result.stdout.strip()
-                
-                if not to_commit:
-                    Log.error(self, f"Version {to_version} not found in git history")
-                    Log.error(self, "")
-                    Log.error(self, "View available versions:")
-                    Log.error(self, "  wo multitenancy history")
-            
-            # Show what we're rolling back to
+            # Find the commit for that version and its --stat summary in one
+            # git call: the first line is the full hash, the rest is shown.
+            # Baseline history is linear on HEAD, so only that chain is
+            # walked, and the subject must start with the version tag. The
+            # grep alone selects the commit, so there is no pathspec: git
+            # does not diff every commit it walks for TREESAME checks.
+            # --git-dir pins the repository to shared_root, so a missing
+            # .git is reported by this call instead of a separate stat.
+            # The --stat preview is only computed when someone will read it
+            # before confirming.
+            preview = not (pargs.force or pargs.yes)
+            argv = ['git', '--git-dir=.git', 'log', '--first-parent', 'HEAD',
+                    '--no-renames', '--grep', f'^Baseline v{to_version}:',
+                    '-1', '--format=%H%n%h %s']
+            if preview:
+                argv.append('--stat')
             result = subprocess.run(
-                ['git', 'show', '--stat', '--oneline', to_commit, '--', 'config/baseline.json'],
+                argv,
                 cwd=shared_root,
                 capture_output=True,
                 text=True,
-                check=True
             )
+            if result.returncode:
+                if 'not a git repository' in result.stderr:
+                    Log.error(self, "Git tracking not initialized")
+                    Log.error(self, "Cannot rollback without git history")
+                raise subprocess.CalledProcessError(
+                    result.returncode, argv, result.stdout, result.stderr)
             
-            Log.info(self, "Rolling back to:")
-            # Show first few lines of git show output
-            output_lines = result.stdout.split('\n')[:10]
-            for line in output_lines:
-                Log.info(self, f"  {line}")
+            to_commit, _, summary = result.stdout.strip().partition('\n')
             
-            if len(result.stdout.split('\n')) > 10:
-                Log.info(self, "  ...")
+            if not to_commit:
+                Log.error(self, f"Version {to_version} not found in git history")
+                Log.error(self, "")
+                Log.error(self, "View available versions:")
+                Log.error(self, "  wo multitenancy history")
             
-            Log.info(self, "")
+            if preview:
+                # Show the first lines of the --stat summary, logged as one
+                # block.
+                output_lines = summary.split('\n')
+                block = ["Rolling back to:"]
+                block += [f"  {line}" for line in output_lines[:10]]
+                if len(output_lines) > 10:
+                    block.append("  ...")
+                block.append("")
+                Log.info(self, "\n".join(block))
             
             # Confirm with user (unless forced)
-            if not pargs.force:
-                confirm = input("Proceed with rollback? [y/N]: ").strip().lower()
-                if confirm != 'y':
-                    Log.info(self, "Rollback cancelled")
-                    return
+            if not self._confirm("Proceed with rollback? [y/N]: ",
+                                 not preview):
+                Log.info(self, "Rollback cancelled")
+                return
             
-            # Perform rollback by checking out the specific file from that commit
-            subprocess.run(
-                ['git', 'checkout', to_commit, '--', 'config/baseline.json'],
+            # Read the old content straight from the object store; the new
+            # version is written below, so no checkout of the file is needed.
+            result = subprocess.run(
+                ['git', 'show', f'{to_commit}:config/baseline.json'],
                 cwd=shared_root,
                 capture_output=True,
+                text=True,
                 check=True
             )
-            
-            # Read the rolled-back baseline
-            with open(baseline_file, 'r') as f:
-                rolled_back = json.load(f)
+            rolled_back = json.loads(result.stdout)
 
             # Mint a NEW version for the rolled-back content: versions only
             # move forward, so `validate` flags every site as outdated and
             # `apply` re-converges the fleet.
             new_version = current_version + 1
             rolled_back['version'] = new_version
-            rolled_back['generated'] = datetime.now().isoformat()
-            with open(baseline_file, 'w') as f:
-                json.dump(rolled_back, f, indent=2)
+            rolled_back['generated'] = MTFunctions.baseline_timestamp()
+            MTFunctions.write_baseline(baseline_file, rolled_back)
 
             # Commit documenting the rollback. The `Baseline v{N}:` prefix is
             # load-bearing: the rollback finder above greps for it.
             commit_msg = (
                 f"Baseline v{new_version}: Rollback to v{to_version} content"
             )
-            add = subprocess.run(
-                ['git', 'add', 'config/baseline.json'],
-                cwd=shared_root,
-                capture_output=True,
-                text=True,
-            )
-            if add.returncode != 0:
-                Log.error(self, f"git add failed: {add.stderr}")
             commit = subprocess.run(
-                ['git', 'commit', '-m', commit_msg],
+                ['git', 'commit', '-m', commit_msg, '--',
+                 'config/baseline.json'],
                 cwd=shared_root,
                 capture_output=True,
                 text=True,
@@ -3072,10 +3437,12 @@ class WOMultitenancyController(CementBaseController):
                 BaselineApplicator.apply_baseline_to_sites(
                     self, config, new_version)
             else:
-                Log.info(self, "")
-                Log.info(self, "Baseline rolled back in configuration.")
-                Log.info(self, f"Sites are still on v{current_version}.")
-                Log.info(self, "Run: wo multitenancy apply")
+                Log.info(self, "\n".join([
+                    "",
+                    "Baseline rolled back in configuration.",
+                    f"Sites are still on v{current_version}.",
+                    "Run: wo multitenancy apply",
+                ]))
             
         except subprocess.CalledProcessError as e:
             Log.error(self, f"Rollback failed: {e}")
@@ -3128,6 +3495,11 @@ class WOMultitenancyController(CementBaseController):
         site_filter = pargs.site_filter or (
             pargs.site_name if pargs.site_name else None
         )
+        # Only this command needs the health checks (and their urllib/socket
+        # imports), so they load here rather than with the plugin.
+        from wo.cli.plugins.multitenancy_health import (
+            HealthChecker, render_text as render_health_text
+        )
         checker = HealthChecker(self).register_defaults(site_filter=site_filter)
         result = checker.run_all()
         if getattr(pargs, 'json_output', False):
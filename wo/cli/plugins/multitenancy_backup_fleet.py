@@ -19,7 +19,7 @@ import subprocess
 import tempfile
 
 from wo.core.logging import Log
-from wo.core.database import db_session
+from wo.core.database import db_session, engine
 from wo.cli.plugins.sitedb import getSiteInfo
 from wo.cli.plugins.multitenancy_db import MultitenancySite
 from wo.cli.plugins.multitenancy_functions import MTFunctions
@@ -1197,6 +1197,14 @@ def _restore_fleet_locked(controller, pargs):
 
     # The first live write is the verified snapshot database cutover.
     db_session.remove()
+    # Close the pooled connection too: the last close checkpoints the WAL,
+    # and a leftover -wal must never be replayed onto the restored file.
+    engine.dispose()
+    for suffix in ('-wal', '-shm'):
+        try:
+            os.unlink('/var/lib/wo/dbase.db' + suffix)
+        except FileNotFoundError:
+            pass
     os.replace(staged_dbase, '/var/lib/wo/dbase.db')
     _ensure_mode('/var/lib/wo/dbase.db', 0o600)
     shutil.rmtree(dbase_target, ignore_errors=True)
@@ -10,6 +10,7 @@ from wo.core.logging import Log
 DB_PERIOD_SECONDS = 3600
 DB_STALE_SECONDS = 2 * DB_PERIOD_SECONDS
 CHECK_WARNING_SECONDS = 35 * 86400
+QUARANTINE_DISPLAY_LIMIT = 50
 
 
 def _backup_api():
@@ -274,20 +275,18 @@ def _read_operation_id(directory):
     return '-'
 
 
-def _quarantine_entries(root):
-    entries = []
+def _quarantine_entries(root, limit=None):
+    """Return (entries, total); manifests are read for the first limit only."""
     try:
-        names = sorted(os.listdir(root))
+        with os.scandir(root) as scan:
+            names = sorted(entry.name for entry in scan if entry.is_dir())
     except OSError:
-        return entries
-    for name in names:
-        path = os.path.join(root, name)
-        try:
-            if os.path.isdir(path):
-                entries.append((name, _read_operation_id(path)))
-        except OSError:
-            continue
-    return entries
+        return [], 0
+    shown = names if limit is None else names[:limit]
+    entries = [
+        (name, _read_operation_id(os.path.join(root, name))) for name in shown
+    ]
+    return entries, len(names)
 
 
 def _stats_payload(result):
@@ -479,12 +478,15 @@ def _print_tombstones(controller, api, config):
 
 def _print_quarantine(controller, api):
     _info(controller, 'QUARANTINE:')
-    entries = _quarantine_entries(api['QUARANTINE_ROOT'])
+    entries, total = _quarantine_entries(
+        api['QUARANTINE_ROOT'], limit=QUARANTINE_DISPLAY_LIMIT)
     if not entries:
         _info(controller, '  none')
         return
     for name, operation_id in entries:
         _info(controller, f'  {name}: manifest op_id={operation_id}')
+    if total > len(entries):
+        _info(controller, f'  ... and {total - len(entries)} more')
 
 
 def _print_anomalies(controller, state):
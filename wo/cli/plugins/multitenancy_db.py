@@ -7,7 +7,11 @@ import json
 from datetime import datetime
 from wo.core.logging import Log
 from wo.core.database import db_session, Base
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, case, exists, func, select, true, update
+from sqlalchemy.exc import SQLAlchemyError
+
+# Stay well below SQLite's bound-parameter limit (999 before 3.32).
+SQL_IN_CHUNK = 500
 
 
 class MultitenancyConfig(Base):
@@ -55,79 +59,123 @@ class MultitenancySite(Base):
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
 
+# Columns add_shared_site may overwrite on an existing row; computed once
+# instead of rebuilding the column list on every call.
+_SITE_UPDATE_COLUMNS = frozenset(
+    MultitenancySite.__table__.columns.keys()) - {'id', 'domain', 'created_at'}
+
+# Columns added to multitenancy_sites after the first release, in the order
+# initialize_tables ALTERs them onto older databases.
+_MIGRATED_COLUMNS = (
+    ('redis_prefix', 'TEXT'),
+    ('redis_db', 'INTEGER'),
+)
+
+# Secondary indexes on the multitenancy tables, keyed by name so
+# initialize_tables can skip the ones sqlite_master already lists.
+_INDEXES = (
+    ('idx_redis_prefix_unique', '''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_redis_prefix_unique
+        ON multitenancy_sites(redis_prefix)
+        WHERE redis_prefix IS NOT NULL
+    '''),
+    ('idx_redis_prefix', '''
+        CREATE INDEX IF NOT EXISTS idx_redis_prefix
+        ON multitenancy_sites(redis_prefix)
+    '''),
+    ('idx_redis_db_unique', '''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_redis_db_unique
+        ON multitenancy_sites(redis_db)
+        WHERE redis_db IS NOT NULL
+    '''),
+    # validate and apply filter on is_enabled; with the version and domain
+    # alongside (id is the rowid), validate's fleet summary reads only this
+    # index.
+    ('idx_sites_enabled_baseline', '''
+        CREATE INDEX IF NOT EXISTS idx_sites_enabled_baseline
+        ON multitenancy_sites(is_enabled, baseline_version, domain)
+    '''),
+    # get_current_release looks up the single is_current row; the partial
+    # index holds just that row instead of scanning every release.
+    ('idx_mt_release_current', '''
+        CREATE INDEX IF NOT EXISTS idx_mt_release_current
+        ON multitenancy_releases(is_current)
+        WHERE is_current = 1
+    '''),
+)
+
+
 class MTDatabase:
     """Multi-tenancy database operations"""
     
     @staticmethod
     def initialize_tables(app):
-        """Create multi-tenancy tables if they don't exist"""
+        """Create multi-tenancy tables if they don't exist
+
+        Runs from the post_setup hook on every `wo` invocation, so the
+        common case (schema already current) is one sqlite_master read plus
+        one table_info; only missing tables, columns and indexes are
+        created. pysqlite autocommits each DDL statement, so an interrupted
+        migration leaves the schema partly upgraded and the next run
+        finishes it.
+        """
         try:
+            from sqlalchemy import text, inspect
+            existing = set(db_session.execute(text(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'index')"
+            )).scalars())
+            
             # Create tables in WordOps main database (dbase.db)
-            Base.metadata.create_all(bind=db_session.bind)
+            missing_tables = [
+                table for table in Base.metadata.sorted_tables
+                if table.name not in existing
+            ]
+            if missing_tables:
+                Base.metadata.create_all(bind=db_session.bind,
+                                         tables=missing_tables)
             
             Log.debug(app, "Multi-tenancy database tables initialized")
             
             # *** PHASE 2 MIGRATION: Add new columns if they don't exist ***
-            from sqlalchemy import text, inspect
-            
             try:
                 inspector = inspect(db_session.bind)
-                existing_columns = [col['name'] for col in inspector.get_columns('multitenancy_sites')]
-                
-                if 'redis_prefix' not in existing_columns:
-                    Log.info(app, "Adding redis_prefix column...")
-                    try:
-                        db_session.execute(text("""
-                            ALTER TABLE multitenancy_sites
-                            ADD COLUMN redis_prefix TEXT
-                        """))
-                        db_session.commit()
-                        Log.debug(app, "Added redis_prefix column")
-                    except Exception:
-                        pass  # Column might already exist
-
-                # Ensure redis_prefix indexes exist (idempotent — covers fresh
-                # installs where create_all() makes the column but not the index).
-                try:
-                    db_session.execute(text('''
-                        CREATE UNIQUE INDEX IF NOT EXISTS idx_redis_prefix_unique
-                        ON multitenancy_sites(redis_prefix)
-                        WHERE redis_prefix IS NOT NULL
-                    '''))
-                    db_session.execute(text('''
-                        CREATE INDEX IF NOT EXISTS idx_redis_prefix
-                        ON multitenancy_sites(redis_prefix)
-                    '''))
-                    db_session.commit()
-                    Log.debug(app, "Ensured redis_prefix indexes")
-                except Exception:
-                    pass  # Indexes might already exist
+                existing_columns = {col['name'] for col in inspector.get_columns('multitenancy_sites')}
 
-                if 'redis_db' not in existing_columns:
-                    Log.info(app, "Adding redis_db column...")
+                # The diff against table_info guarantees each ALTER targets
+                # a column that is really missing, so a rerun after a partial
+                # migration only adds what is still absent.
+                changed = False
+                for name, ddl_type in _MIGRATED_COLUMNS:
+                    if name in existing_columns:
+                        continue
+                    Log.info(app, f"Adding {name} column...")
+                    db_session.execute(text(
+                        f"ALTER TABLE multitenancy_sites ADD COLUMN {name} {ddl_type}"
+                    ))
+                    changed = True
+                    Log.debug(app, f"Added {name} column")
+
+                # Ensure indexes exist (covers fresh installs where
+                # create_all() makes the columns but not these indexes).
+                for name, ddl in _INDEXES:
+                    if name in existing:
+                        continue
                     try:
-                        db_session.execute(text("""
-                            ALTER TABLE multitenancy_sites
-                            ADD COLUMN redis_db INTEGER
-                        """))
-                        db_session.commit()
-                        Log.debug(app, "Added redis_db column")
+                        db_session.execute(text(ddl))
+                        changed = True
+                        Log.debug(app, f"Ensured {name} index")
                     except Exception:
-                        pass  # Column might already exist
-
-                try:
-                    db_session.execute(text('''
-                        CREATE UNIQUE INDEX IF NOT EXISTS idx_redis_db_unique
-                        ON multitenancy_sites(redis_db)
-                        WHERE redis_db IS NOT NULL
-                    '''))
+                        pass  # Index might already exist
+                if changed:
                     db_session.commit()
-                    Log.debug(app, "Ensured redis_db index")
-                except Exception:
-                    pass  # Index might already exist
+                if changed or missing_tables:
+                    # Analyze whatever the schema change left without
+                    # planner statistics, once, instead of on later reads.
+                    db_session.execute(text('PRAGMA optimize=0x10002'))
 
             except Exception as migration_error:
                 Log.debug(app, f"Migration check/execution: {migration_error}")
+                db_session.rollback()
                 # Don't fail initialization if migration fails
             
         except Exception as e:
@@ -137,51 +185,54 @@ class MTDatabase:
     def is_initialized(app):
         """Check if multi-tenancy is initialized"""
         try:
-            session = db_session
-            config = session.query(MultitenancyConfig).filter_by(
-                key='initialized'
-            ).first()
-            return config is not None and config.value == 'true'
-        except:
+            return MTDatabase.get_config(app, 'initialized') == 'true'
+        except SQLAlchemyError:
             return False
     
+    @staticmethod
+    def _config_cache(session):
+        """Memo of multitenancy_config values for the session's lifetime.
+
+        Lives in ``session.info``, so a new (or removed) session starts
+        empty; _upsert_config clears it on every write.
+        """
+        return session.info.setdefault('mt_config', {})
+    
+    @staticmethod
+    def _upsert_config(session, items):
+        """Upsert ``(key, value)`` pairs into multitenancy_config.
+
+        One multi-row INSERT ... ON CONFLICT(key) DO UPDATE; rows whose
+        value is unchanged are left alone, as the ORM did.
+        """
+        from sqlalchemy.dialects.sqlite import insert
+        MTDatabase._config_cache(session).clear()
+        stmt = insert(MultitenancyConfig.__table__).values(
+            [{'key': key, 'value': value} for key, value in items])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['key'],
+            # Core upserts bypass onupdate, so stamp the row here.
+            set_={'value': stmt.excluded.value, 'updated_at': datetime.now()},
+            where=MultitenancyConfig.value.is_distinct_from(stmt.excluded.value),
+        )
+        session.execute(stmt)
+
     @staticmethod
     def save_config(app, config_dict):
         """Save configuration to database"""
         try:
             session = db_session
-            for key, value in config_dict.items():
-                config = session.query(MultitenancyConfig).filter_by(
-                    key=key
-                ).first()
-
-                if config:
-                    config.value = str(value)
-                    config.updated_at = datetime.now()
-                else:
-                    config = MultitenancyConfig(
-                        key=key,
-                        value=str(value)
-                    )
-                    session.add(config)
-            
+            items = {key: str(value) for key, value in config_dict.items()}
             # Mark as initialized
-            initialized = session.query(MultitenancyConfig).filter_by(
-                key='initialized'
-            ).first()
-            
-            if not initialized:
-                initialized = MultitenancyConfig(
-                    key='initialized',
-                    value='true'
-                )
-                session.add(initialized)
+            items.setdefault('initialized', 'true')
+            MTDatabase._upsert_config(session, items.items())
             
             session.commit()
             Log.debug(app, "Configuration saved to database")
             return True
 
         except Exception as e:
+            session.rollback()
             Log.error(app, f"Failed to save configuration: {e}", False)
             return False
     
@@ -190,13 +241,13 @@ class MTDatabase:
         """Get configuration value from database"""
         try:
             session = db_session
-            config = session.query(MultitenancyConfig).filter_by(
-                key=key
-            ).first()
-            
-            if config:
-                return config.value
-            return None
+            cache = MTDatabase._config_cache(session)
+            if key not in cache:
+                config = session.query(MultitenancyConfig).filter_by(
+                    key=key
+                ).first()
+                cache[key] = config.value if config else None
+            return cache[key]
                 
         except Exception as e:
             Log.debug(app, f"Failed to get config {key}: {e}")
@@ -207,12 +258,12 @@ class MTDatabase:
         """Get current active release"""
         try:
             session = db_session
-            release = session.query(MultitenancyRelease).filter_by(
+            release = session.query(MultitenancyRelease.release_name).filter_by(
                 is_current=True
             ).first()
             
             if release:
-                return release.release_name
+                return release[0]
             
             # Fallback to config
             return MTDatabase.get_config(app, 'current_release')
@@ -226,46 +277,33 @@ class MTDatabase:
         """Update current release"""
         try:
             session = db_session
-            # Mark all releases as not current
-            session.query(MultitenancyRelease).update(
-                {'is_current': False}
+            from sqlalchemy.dialects.sqlite import insert
+            # Mark all releases as not current ("= 1", not IS, so the
+            # partial idx_mt_release_current index still matches)
+            session.execute(
+                update(MultitenancyRelease)
+                .where(MultitenancyRelease.is_current == true())
+                .values(is_current=False)
+                .execution_options(synchronize_session=False)
             )
             
-            # Check if release exists
-            release = session.query(MultitenancyRelease).filter_by(
-                release_name=release_name
-            ).first()
-            
-            if release:
-                release.is_current = True
-            else:
-                # Create new release entry
-                release = MultitenancyRelease(
-                    release_name=release_name,
-                    is_current=True
-                )
-                session.add(release)
+            # Insert the release, or flag the existing row as current
+            session.execute(
+                insert(MultitenancyRelease.__table__)
+                .values(release_name=release_name, is_current=True)
+                .on_conflict_do_update(index_elements=['release_name'],
+                                       set_={'is_current': True})
+            )
             
             # Update config
-            config = session.query(MultitenancyConfig).filter_by(
-                key='current_release'
-            ).first()
-            
-            if config:
-                config.value = release_name
-                config.updated_at = datetime.now()
-            else:
-                config = MultitenancyConfig(
-                    key='current_release',
-                    value=release_name
-                )
-                session.add(config)
+            MTDatabase._upsert_config(session, [('current_release', release_name)])
             
             session.commit()
             Log.debug(app, f"Updated current release to {release_name}")
             return True
 
         except Exception as e:
+            session.rollback()
             Log.error(app, f"Failed to update release: {e}", False)
             return False
     
@@ -275,73 +313,67 @@ class MTDatabase:
         try:
             version = MTDatabase.get_config(app, 'baseline_version')
             return int(version) if version else 1
-        except:
+        except (ValueError, TypeError):
             return 1
     
     
     @staticmethod
-    def add_shared_site(app, domain, site_data):
-        """Add a site to shared sites tracking"""
+    def add_shared_site(app, domain, site_data, exit=True):
+        """Add a site to shared sites tracking; False if that failed"""
         try:
             session = db_session
-            # Check if site already exists
-            site = session.query(MultitenancySite).filter_by(
-                domain=domain
-            ).first()
-            
-            if site:
-                # Update existing site
-                for key, value in site_data.items():
-                    if hasattr(site, key):
-                        setattr(site, key, value)
-                site.updated_at = datetime.now()
-            else:
-                # Create new site entry
-                site = MultitenancySite(
-                    domain=domain,
-                    site_type=site_data.get('site_type', 'wp'),
-                    cache_type=site_data.get('cache_type', 'basic'),
-                    site_path=site_data.get('site_path', f'/var/www/{domain}'),
-                    php_version=site_data.get('php_version', '8.4'),
-                    shared_release=site_data.get('shared_release'),
-                    is_ssl=site_data.get('is_ssl', False),
-                    redis_prefix=site_data.get('redis_prefix'),  # Phase 2: Store Redis prefix
-                    redis_db=site_data.get('redis_db'),
-                )
-                session.add(site)
+            # One upsert instead of SELECT-then-INSERT/UPDATE: the common
+            # case is a fresh create, and the UNIQUE(domain) constraint
+            # routes an existing row to the update branch.
+            from sqlalchemy.dialects.sqlite import insert
+            updates = {
+                key: value for key, value in site_data.items()
+                if key in _SITE_UPDATE_COLUMNS
+            }
+            # Core upserts bypass onupdate, so stamp the row here.
+            updates['updated_at'] = datetime.now()
+            stmt = insert(MultitenancySite.__table__).values(
+                domain=domain,
+                site_type=site_data.get('site_type', 'wp'),
+                cache_type=site_data.get('cache_type', 'basic'),
+                site_path=site_data.get('site_path', f'/var/www/{domain}'),
+                php_version=site_data.get('php_version', '8.4'),
+                shared_release=site_data.get('shared_release'),
+                is_ssl=site_data.get('is_ssl', False),
+                redis_prefix=site_data.get('redis_prefix'),  # Phase 2: Store Redis prefix
+                redis_db=site_data.get('redis_db'),
+            ).on_conflict_do_update(index_elements=['domain'], set_=updates)
+            session.execute(stmt)
             
             session.commit()
             Log.debug(app, f"Added shared site: {domain}")
+            return True
                 
         except Exception as e:
-            Log.error(app, f"Failed to add shared site: {e}")
+            session.rollback()
+            Log.error(app, f"Failed to add shared site: {e}", exit=exit)
+            return False
     
+    # Columns exposed by get_shared_sites(); selected as plain rows so no
+    # ORM instance is built per site.
+    _SITE_DICT_COLUMNS = (
+        'domain', 'site_type', 'cache_type', 'site_path', 'php_version',
+        'shared_release', 'baseline_version', 'is_enabled', 'is_ssl',
+        'redis_prefix', 'redis_db', 'created_at', 'updated_at',
+    )
+
+    @staticmethod
+    def _shared_site_dicts(session):
+        """All tracked sites as plain dicts, straight from a Core select."""
+        table = MultitenancySite.__table__
+        stmt = select(*(table.c[name] for name in MTDatabase._SITE_DICT_COLUMNS))
+        return [dict(row) for row in session.execute(stmt).mappings()]
+
     @staticmethod
     def get_shared_sites(app):
         """Get list of all shared sites"""
         try:
-            session = db_session
-            sites = session.query(MultitenancySite).all()
-            
-            result = []
-            for site in sites:
-                result.append({
-                    'domain': site.domain,
-                    'site_type': site.site_type,
-                    'cache_type': site.cache_type,
-                    'site_path': site.site_path,
-                    'php_version': site.php_version,
-                    'shared_release': site.shared_release,
-                    'baseline_version': site.baseline_version,
-                    'is_enabled': site.is_enabled,
-                    'is_ssl': site.is_ssl,
-                    'redis_prefix': getattr(site, 'redis_prefix', None),
-                    'redis_db': getattr(site, 'redis_db', None),
-                    'created_at': site.created_at,
-                    'updated_at': site.updated_at
-                })
-
-            return result
+            return MTDatabase._shared_site_dicts(db_session)
                 
         except Exception as e:
             Log.debug(app, f"Failed to get shared sites: {e}")
@@ -352,55 +384,72 @@ class MTDatabase:
         """Check if a site is using shared core"""
         try:
             session = db_session
-            site = session.query(MultitenancySite).filter_by(
-                domain=domain
-            ).first()
-            return site is not None
+            # EXISTS probe on the unique domain index; no row is returned.
+            return bool(session.execute(
+                select(exists().where(MultitenancySite.domain == domain))
+            ).scalar())
                 
-        except:
+        except SQLAlchemyError:
             return False
     
     @staticmethod
     def remove_shared_site(app, domain):
         """Remove a site from shared sites tracking"""
         try:
-            session = db_session
-            site = session.query(MultitenancySite).filter_by(
-                domain=domain
-            ).first()
-            
-            if site:
-                session.delete(site)
-                session.commit()
+            if MTDatabase.delete_sites(app, [domain]):
                 Log.debug(app, f"Removed shared site: {domain}")
                 return True
-            
             return False
-                
+
         except Exception as e:
             Log.error(app, f"Failed to remove shared site: {e}")
             return False
-    
+
     @staticmethod
-    def update_site_baseline(app, domain, version):
-        """Update baseline version for a site"""
+    def delete_sites(app, domains):
+        """Remove tracking rows for the given domains in bulk.
+
+        Issues one DELETE ... WHERE domain IN (...) per chunk and commits
+        once. Returns the number of rows removed; on failure the session is
+        rolled back and the exception re-raised for the caller to report.
+        """
+        domains = list(domains)
+        session = db_session
+        removed = 0
         try:
-            session = db_session
-            site = session.query(MultitenancySite).filter_by(
-                domain=domain
-            ).first()
-            
-            if site:
-                site.baseline_version = version
-                site.updated_at = datetime.now()
-                session.commit()
+            for start in range(0, len(domains), SQL_IN_CHUNK):
+                batch = domains[start:start + SQL_IN_CHUNK]
+                removed += session.query(MultitenancySite).filter(
+                    MultitenancySite.domain.in_(batch)
+                ).delete(synchronize_session=False)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        return removed
+
+    @staticmethod
+    def update_site_baseline(app, domain, version, exit=True):
+        """Update baseline version for a site with a single UPDATE"""
+        session = db_session
+        try:
+            result = session.execute(
+                update(MultitenancySite)
+                .where(MultitenancySite.domain == domain)
+                .values(baseline_version=version)
+                .execution_options(synchronize_session=False)
+            )
+            session.commit()
+            if result.rowcount:
                 Log.debug(app, f"Updated baseline version for {domain} to {version}")
                 return True
-            
+
+            Log.debug(app, f"No tracking row to update baseline for {domain}")
             return False
-                
+
         except Exception as e:
-            Log.error(app, f"Failed to update site baseline: {e}")
+            session.rollback()
+            Log.error(app, f"Failed to update site baseline: {e}", exit=exit)
             return False
     
     @staticmethod
@@ -441,47 +490,125 @@ class MTDatabase:
         """Clean up multi-tenancy database entries"""
         try:
             session = db_session
+            # Unfiltered DELETEs on trigger-free tables take SQLite's
+            # truncate path (pages freed, rows never visited), also inside
+            # one transaction; nothing in the identity map needs syncing.
+            MTDatabase._config_cache(session).clear()
             # Delete all multi-tenancy config
-            session.query(MultitenancyConfig).delete()
+            session.query(MultitenancyConfig).delete(synchronize_session=False)
             
             # Delete all releases
-            session.query(MultitenancyRelease).delete()
+            session.query(MultitenancyRelease).delete(synchronize_session=False)
             
             # Delete all shared sites
-            session.query(MultitenancySite).delete()
+            session.query(MultitenancySite).delete(synchronize_session=False)
             
             session.commit()
             Log.debug(app, "Cleaned up multi-tenancy database")
                 
         except Exception as e:
+            session.rollback()
             Log.error(app, f"Failed to cleanup database: {e}")
     
+    @staticmethod
+    def get_status_snapshot(app):
+        """Read initialized flag, release, baseline version and sites at once.
+
+        One read transaction instead of a round-trip per getter; values
+        match is_initialized(), get_current_release(),
+        get_baseline_version() and get_shared_sites().
+        """
+        snapshot = {
+            'initialized': False,
+            'current_release': None,
+            'baseline_version': 1,
+            'shared_sites': [],
+        }
+        try:
+            session = db_session
+            config = dict(
+                session.query(
+                    MultitenancyConfig.key, MultitenancyConfig.value
+                ).filter(MultitenancyConfig.key.in_(
+                    ('initialized', 'current_release', 'baseline_version')
+                )).all()
+            )
+            snapshot['initialized'] = config.get('initialized') == 'true'
+            if not snapshot['initialized']:
+                return snapshot
+            release = session.query(MultitenancyRelease.release_name).filter_by(
+                is_current=True
+            ).first()
+            snapshot['current_release'] = (
+                release[0] if release else config.get('current_release')
+            )
+            try:
+                version = config.get('baseline_version')
+                snapshot['baseline_version'] = int(version) if version else 1
+            except ValueError:
+                pass
+            snapshot['shared_sites'] = MTDatabase._shared_site_dicts(session)
+        except Exception as e:
+            Log.debug(app, f"Failed to read status snapshot: {e}")
+        return snapshot
+
+    @staticmethod
+    def get_validation_snapshot(app, baseline_version, limit=10):
+        """Count enabled sites and list the first outdated ones in one query.
+
+        Window aggregates carry the fleet-wide totals on every row, and
+        outdated rows sort first, so a single LIMITed SELECT answers both.
+        NULL versions count as 0. Returns ``{'total': N, 'outdated_count': M,
+        'outdated': [(domain, version), ...]}`` with at most ``limit`` entries.
+        """
+        site_version = func.coalesce(MultitenancySite.baseline_version, 0)
+        outdated = case((site_version < baseline_version, 1), else_=0)
+        rows = db_session.query(
+            MultitenancySite.domain, site_version,
+            func.count().over(), func.sum(outdated).over(),
+        ).filter(
+            MultitenancySite.is_enabled.is_(True)
+        ).order_by(outdated.desc(), MultitenancySite.id).limit(limit).all()
+        if not rows:
+            return {'total': 0, 'outdated_count': 0, 'outdated': []}
+        return {
+            'total': rows[0][2],
+            'outdated_count': rows[0][3],
+            'outdated': [(domain, version) for domain, version, _, _ in rows
+                         if version < baseline_version],
+        }
+
     @staticmethod
     def get_stats(app):
         """Get multi-tenancy statistics"""
         try:
             session = db_session
-            total_sites = session.query(MultitenancySite).count()
-            enabled_sites = session.query(MultitenancySite).filter_by(
-                is_enabled=True
-            ).count()
-            ssl_sites = session.query(MultitenancySite).filter_by(
-                is_ssl=True
-            ).count()
-            total_releases = session.query(MultitenancyRelease).count()
-            
-            # Get PHP version distribution
+            # One GROUP BY over (php, cache) pairs carries every count; the
+            # totals and both distributions are folded from its few rows.
+            # NULL or empty php_version -> 'unknown', cache_type -> 'none'.
+            php_ver = func.coalesce(
+                func.nullif(MultitenancySite.php_version, ''), 'unknown')
+            cache = func.coalesce(
+                func.nullif(MultitenancySite.cache_type, ''), 'none')
+            rows = session.execute(
+                select(
+                    php_ver, cache, func.count(),
+                    func.sum(case((MultitenancySite.is_enabled.is_(True), 1), else_=0)),
+                    func.sum(case((MultitenancySite.is_ssl.is_(True), 1), else_=0)),
+                ).group_by(php_ver, cache)
+            ).all()
+            total_releases = session.query(
+                func.count(MultitenancyRelease.id)).scalar()
+
+            total_sites = enabled_sites = ssl_sites = 0
             php_stats = {}
-            sites = session.query(MultitenancySite).all()
-            for site in sites:
-                php_ver = site.php_version or 'unknown'
-                php_stats[php_ver] = php_stats.get(php_ver, 0) + 1
-            
-            # Get cache type distribution
             cache_stats = {}
-            for site in sites:
-                cache = site.cache_type or 'none'
-                cache_stats[cache] = cache_stats.get(cache, 0) + 1
+            for php, cache_type, count, enabled, ssl in rows:
+                total_sites += count
+                enabled_sites += enabled
+                ssl_sites += ssl
+                php_stats[php] = php_stats.get(php, 0) + count
+                cache_stats[cache_type] = cache_stats.get(cache_type, 0) + count
             
             return {
                 'total_sites': total_sites,
@@ -553,7 +680,7 @@ class MTDatabase:
         return prefix
 
     @staticmethod
-    def allocate_redis_db(app, domain):
+    def allocate_redis_db(app, domain, exit=True):
         """Return the site's dedicated Redis database number, allocating the
         smallest free one (>= 1) if the site has none yet.
 
@@ -569,11 +696,12 @@ class MTDatabase:
         """
         try:
             session = db_session
-            site = session.query(MultitenancySite).filter_by(
-                domain=domain
-            ).first()
-            if site is not None and getattr(site, 'redis_db', None):
-                return site.redis_db
+            current = session.execute(
+                select(MultitenancySite.redis_db)
+                .where(MultitenancySite.domain == domain)
+            ).scalar_one_or_none()
+            if current:
+                return current
 
             used = {
                 row[0] for row in session.query(
@@ -586,7 +714,9 @@ class MTDatabase:
             Log.debug(app, f"Allocated Redis database {candidate} for {domain}")
             return candidate
         except Exception as e:
-            Log.error(app, f"Failed to allocate Redis database for {domain}: {e}")
+            Log.error(app, f"Failed to allocate Redis database for {domain}: {e}",
+                      exit=exit)
+            return None
     
     @staticmethod
     def check_redis_prefix_exists(app, prefix):
@@ -614,13 +744,15 @@ class MTDatabase:
             session = db_session
             
             # Query for any site with this Redis prefix
-            site = session.query(MultitenancySite).filter_by(
-                redis_prefix=prefix
-            ).first()
+            owner = session.execute(
+                select(MultitenancySite.domain)
+                .where(MultitenancySite.redis_prefix == prefix)
+                .limit(1)
+            ).scalar()
             
-            if site:
-                Log.debug(app, f"Redis prefix '{prefix}' is used by: {site.domain}")
-                return site.domain
+            if owner:
+                Log.debug(app, f"Redis prefix '{prefix}' is used by: {owner}")
+                return owner
             
             Log.debug(app, f"Redis prefix '{prefix}' is available")
             return None
@@ -654,13 +786,16 @@ class MTDatabase:
         try:
             session = db_session
             
-            # Find the site record
-            site = session.query(MultitenancySite).filter_by(domain=domain).first()
+            # Update the Redis prefix in place; rowcount says whether the
+            # site exists, so no SELECT is needed first
+            result = session.execute(
+                update(MultitenancySite)
+                .where(MultitenancySite.domain == domain)
+                .values(redis_prefix=prefix)
+                .execution_options(synchronize_session=False)
+            )
             
-            if site:
-                # Update the Redis prefix
-                site.redis_prefix = prefix
-                site.updated_at = datetime.now()
+            if result.rowcount:
                 session.commit()
                 
                 Log.debug(app, f"Set Redis prefix for {domain}: {prefix}")
@@ -699,12 +834,15 @@ class MTDatabase:
         try:
             session = db_session
             
-            # Find the site record
-            site = session.query(MultitenancySite).filter_by(domain=domain).first()
+            # Only the prefix column is needed
+            prefix = session.execute(
+                select(MultitenancySite.redis_prefix)
+                .where(MultitenancySite.domain == domain)
+            ).scalar_one_or_none()
             
-            if site and site.redis_prefix:
-                Log.debug(app, f"Retrieved Redis prefix for {domain}: {site.redis_prefix}")
-                return site.redis_prefix
+            if prefix:
+                Log.debug(app, f"Retrieved Redis prefix for {domain}: {prefix}")
+                return prefix
             else:
                 Log.debug(app, f"No Redis prefix found for: {domain}")
                 return None
@@ -733,13 +871,12 @@ class MTDatabase:
         try:
             session = db_session
             
-            # Query all sites with Redis prefixes
-            sites = session.query(MultitenancySite).filter(
-                MultitenancySite.redis_prefix.isnot(None)
-            ).all()
-            
-            # Build dictionary of domain -> prefix mappings
-            prefixes = {site.domain: site.redis_prefix for site in sites}
+            # Query (domain, prefix) pairs for sites with Redis prefixes;
+            # plain rows, so nothing lands in the identity map
+            prefixes = dict(session.execute(
+                select(MultitenancySite.domain, MultitenancySite.redis_prefix)
+                .where(MultitenancySite.redis_prefix.isnot(None))
+            ).all())
             
             Log.debug(app, f"Found {len(prefixes)} Redis prefixes in use")
             return prefixes
@@ -11,7 +11,7 @@ from wo.core.logging import Log
 def addNewSite(self, site, stype, cache, path,
                enabled=True, ssl=False, fs='ext4', db='mysql',
                db_name=None, db_user=None, db_password=None,
-               db_host='localhost', hhvm=0, php_version='8.4'):
+               db_host='localhost', hhvm=0, php_version='8.4', exit=True):
     """
     Add New Site record information into the wo database.
     """
@@ -21,9 +21,12 @@ def addNewSite(self, site, stype, cache, path,
                         php_version)
         db_session.add(newRec)
         db_session.commit()
+        return True
     except Exception as e:
         Log.debug(self, "{0}".format(e))
-        Log.error(self, "Unable to add site to database")
+        db_session.rollback()
+        Log.error(self, "Unable to add site to database", exit)
+        return False
 
 
 def getSiteInfo(self, site):
@@ -41,16 +44,18 @@ def getSiteInfo(self, site):
 def updateSiteInfo(self, site, stype='', cache='', webroot='',
                    enabled=True, ssl=False, fs='', db='', db_name=None,
                    db_user=None, db_password=None, db_host=None, hhvm=None,
-                   php_version=''):
+                   php_version='', exit=True):
     """updates site record in database"""
     try:
         q = SiteDB.query.filter(SiteDB.sitename == site).first()
     except Exception as e:
         Log.debug(self, "{0}".format(e))
-        Log.error(self, "Unable to query database for site info")
+        Log.error(self, "Unable to query database for site info", exit)
+        return False
 
     if not q:
-        Log.error(self, "{0} does not exist in database".format(site))
+        Log.error(self, "{0} does not exist in database".format(site), exit)
+        return False
 
     # Check if new record matches old if not then only update database
     if stype and q.site_type != stype:
@@ -89,9 +94,13 @@ def updateSiteInfo(self, site, stype='', cache='', webroot='',
     try:
         q.created_on = func.now()
         db_session.commit()
+        return True
     except Exception as e:
         Log.debug(self, "{0}".format(e))
-        Log.error(self, "Unable to update site info in application database.")
+        db_session.rollback()
+        Log.error(self, "Unable to update site info in application database.",
+                  exit)
+        return False
 
 
 def renameSiteInfo(self, old_site, new_site, site_path=None, ssl=None):
@@ -1,12 +1,53 @@
 """WordOps generic database creation module"""
-from sqlalchemy import create_engine
+import atexit
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from wo.core.variables import WOVar
 
 # db_path = self.app.config.get('site', 'db_path')
-engine = create_engine(WOVar.wo_db_uri, convert_unicode=True)
+# SQLAlchemy 1.4 defaults file-backed SQLite to NullPool, which reopens
+# dbase.db (and its journal) for every transaction. Keep one pooled
+# connection instead; it may be checked out from another thread later.
+engine = create_engine(WOVar.wo_db_uri, convert_unicode=True,
+                       poolclass=QueuePool, pool_size=1, max_overflow=4,
+                       connect_args={'check_same_thread': False})
+
+
+@event.listens_for(engine, 'connect')
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    """WAL lets readers run during a write; NORMAL skips the per-commit
+    fsync WAL does not need for durability against process crashes.
+    Sorts and GROUP BY temp b-trees stay in memory rather than temp files."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+    except Exception:
+        # Read-only or unusual filesystems keep the default journal.
+        pass
+    finally:
+        cursor.close()
+
+
+@event.listens_for(engine, 'close')
+def _sqlite_optimize(dbapi_connection, connection_record):
+    """Let SQLite refresh planner statistics it judges stale before the
+    connection goes away; this is a no-op when nothing needs analyzing."""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute('PRAGMA optimize')
+    except Exception:
+        # A read-only database cannot store statistics; close regardless.
+        pass
+    finally:
+        cursor.close()
+
+
 db_session = scoped_session(sessionmaker(autocommit=False,
                                          autoflush=False,
                                          bind=engine))
@@ -14,6 +55,15 @@ Base = declarative_base()
 Base.query = db_session.query_property()
 
 
+@atexit.register
+def _close_connections():
+    """Return the session's connection to the pool, then close the pool,
+    so the 'close' hook above runs once per process. dispose() alone skips
+    the connection a still-open session holds."""
+    db_session.remove()
+    engine.dispose()
+
+
 def init_db(app):
     """
     Initializes and creates all tables from models into the database